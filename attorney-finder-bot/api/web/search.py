@@ -7,6 +7,8 @@ import json
 
 # Add parent directories to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+# src modules import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
 from src.database import AttorneyDatabase
 
@@ -18,7 +20,12 @@ def handler(request):
     """
     Handle search requests from web UI.
 
-    GET /api/web/search?q=query&city=city&zip=zip&practice=area
+    GET /api/web/search?q=query&city=city&zip=zip&radius=miles&practice=area&limit=50&cursor=...
+
+    With radius, attorneys within that many miles of the ZIP code match,
+    nearest first.
+
+    Pass a response's next_cursor as cursor to fetch the following page.
     """
     if request.method != 'GET':
         return {
@@ -31,18 +38,35 @@ def handler(request):
         # Get query parameters
         params = request.args
 
+        query = params.get('q')
         city = params.get('city')
         zip_code = params.get('zip')
         practice_area = params.get('practice')
         limit = int(params.get('limit', 50))
+        cursor = params.get('cursor')
+        radius = params.get('radius')
 
         # Search database
-        results = db.search_attorneys(
-            city=city,
-            zip_code=zip_code,
-            practice_area=practice_area,
-            limit=limit
-        )
+        try:
+            page = db.search_attorneys_page(
+                city=city,
+                zip_code=zip_code,
+                practice_area=practice_area,
+                query=query,
+                page_size=limit,
+                cursor=cursor,
+                radius_miles=float(radius) if radius else None
+            )
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({
+                    'success': False,
+                    'error': str(e)
+                })
+            }
+        results = page['results']
 
         return {
             'statusCode': 200,
@@ -53,7 +77,8 @@ def handler(request):
             'body': json.dumps({
                 'success': True,
                 'count': len(results),
-                'results': results
+                'results': results,
+                'next_cursor': page['next_cursor']
             })
         }
 
@@ -6,6 +6,8 @@ import sys
 import json
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+# src modules import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
 from src.database import AttorneyDatabase
 
@@ -27,6 +29,9 @@ def handler(request):
 
     try:
         stats = db.get_stats()
+        stats['states'] = db.get_state_counts()
+        stats['practice_areas'] = db.get_practice_area_counts()
+        stats['added_per_day'] = db.get_daily_additions()
 
         return {
             'statusCode': 200,
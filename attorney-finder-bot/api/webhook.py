@@ -4,6 +4,8 @@ Handles incoming updates from Telegram Bot API.
 """
 import os
 import json
+import atexit
+import threading
 from telegram import Update
 from telegram.ext import Application, ContextTypes
 import asyncio
@@ -11,30 +13,119 @@ import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# src modules import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from src.bot_handlers import setup_handlers
+from src.bot_handlers import setup_handlers, shutdown_handlers
+from src.send_scheduler import SendScheduler
 
 # Initialize application
 TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 if not TOKEN:
     raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
 
-application = Application.builder().token(TOKEN).build()
+# Outbound requests are paced to Telegram's flood limits
+application = Application.builder().token(TOKEN).rate_limiter(SendScheduler()).build()
 
 # Setup handlers
 setup_handlers(application)
 
 
-async def process_update(update_data):
-    """Process a single update from Telegram."""
-    try:
-        update = Update.de_json(update_data, application.bot)
-        await application.initialize()
-        await application.process_update(update)
-        return {"statusCode": 200, "body": "OK"}
-    except Exception as e:
-        print(f"Error processing update: {e}")
-        return {"statusCode": 500, "body": str(e)}
+class WebhookRuntime:
+    """
+    Event loop that outlives requests, with the Application initialized once.
+
+    A warm instance serves many updates. Creating a loop per update and
+    initializing the Application (a getMe round trip to the Bot API) each
+    time added fixed latency to every message; both now happen once per
+    instance. The loop runs on its own thread, so requests from any thread
+    can submit to it, and loop-bound state (HTTP connection pools, worker
+    semaphores) is reused between updates.
+    """
+
+    def __init__(self, application: Application):
+        """
+        Initialize runtime; the loop starts on the first update.
+
+        Args:
+            application: Application to process updates with
+        """
+        self.application = application
+        self._loop = None
+        self._thread = None
+        self._initialized = None
+        self._lock = threading.Lock()
+
+    def process(self, update_data: dict) -> dict:
+        """
+        Process an update on the runtime's loop and wait for the result.
+
+        Args:
+            update_data: Decoded update JSON
+
+        Returns:
+            Response dict with statusCode and body
+        """
+        future = asyncio.run_coroutine_threadsafe(self._process_update(update_data), self._get_loop())
+        return future.result()
+
+    def shutdown(self):
+        """Shut the Application down and stop the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        if self._initialized is not None and self._initialized.done() and not self._initialized.exception():
+            try:
+                asyncio.run_coroutine_threadsafe(self.application.shutdown(), loop).result(timeout=10)
+            except Exception as e:
+                print(f"Error shutting down application: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the runtime's loop, starting it on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='webhook-loop',
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    async def _initialize(self):
+        """Initialize the Application once; a failed attempt is retried next update."""
+        if self._initialized is None or (self._initialized.done() and self._initialized.exception()):
+            self._initialized = asyncio.ensure_future(self.application.initialize())
+        await asyncio.shield(self._initialized)
+
+    async def _process_update(self, update_data: dict) -> dict:
+        """Process a single update from Telegram."""
+        try:
+            await self._initialize()
+            update = Update.de_json(update_data, self.application.bot)
+            await self.application.process_update(update)
+            return {"statusCode": 200, "body": "OK"}
+        except Exception as e:
+            print(f"Error processing update: {e}")
+            return {"statusCode": 500, "body": str(e)}
+
+
+runtime = WebhookRuntime(application)
+
+
+@atexit.register
+def _shutdown():
+    """Release the runtime and the handlers' workers when the instance exits."""
+    runtime.shutdown()
+    shutdown_handlers()
 
 
 def handler(request):
@@ -62,8 +153,8 @@ def handler(request):
 
         update_data = json.loads(body)
 
-        # Process update asynchronously
-        result = asyncio.run(process_update(update_data))
+        # Process update on the instance's long-lived loop
+        result = runtime.process(update_data)
 
         return result
 
@@ -0,0 +1,443 @@
+"""
+Scraper benchmark over the recorded HTML corpus in benchmarks/corpus.
+
+Runs AttorneyScraper extraction offline and reports pages/sec, time spent
+in each extractor and peak memory per page. Pages in the manifest list the
+number of records they hold, and both extraction entry points (single
+scrapes and directory crawls) must find exactly that many. Results can be saved as a
+baseline and later runs compared against it; any metric that got worse by
+more than the tolerance is flagged and the script exits non-zero.
+
+With --http the corpus is also served from a local HTTP server and crawled
+end to end, measuring fetch throughput without touching real sites.
+
+Usage:
+    python benchmarks/bench_scraper.py
+    python benchmarks/bench_scraper.py --save-baseline
+    python benchmarks/bench_scraper.py --http --rounds 10
+    python benchmarks/bench_scraper.py --check
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Callable, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from extraction import PageIndex
+from phone_normalizer import _normalize_key
+from scraper import AttorneyScraper
+from structured_data import extract_json_ld, find_attorney_entities
+
+
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# A metric must be this much worse than the baseline to count as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Timings below this are dominated by noise and never flagged
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def load_corpus(corpus_dir: str = CORPUS_DIR) -> List[Dict]:
+    """
+    Load the pages listed in the corpus manifest.
+
+    Entries with a ``repeat`` block are inflated by repeating the markup
+    between two markers, so huge pages are generated rather than checked in.
+
+    Args:
+        corpus_dir: Directory holding manifest.json and the HTML files
+
+    Returns:
+        List of page dictionaries with name, url, mode, records (expected
+        record count, or None) and content (bytes)
+    """
+    with open(os.path.join(corpus_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+
+    pages = []
+    for entry in manifest['pages']:
+        with open(os.path.join(corpus_dir, entry['file']), 'rb') as f:
+            content = f.read()
+
+        repeat = entry.get('repeat')
+        if repeat:
+            start_marker, end_marker = (marker.encode('utf-8') for marker in repeat['between'])
+            start = content.index(start_marker) + len(start_marker)
+            end = content.index(end_marker, start)
+            content = content[:start] + content[start:end] * repeat['times'] + content[end:]
+
+        pages.append({
+            'name': entry['name'],
+            'url': entry['url'],
+            'mode': entry.get('mode', 'profile'),
+            'records': entry.get('records'),
+            'content': content
+        })
+
+    return pages
+
+
+def check_records(pages: List[Dict]) -> List[str]:
+    """
+    Compare each page's extracted records with the count in the manifest.
+
+    Both entry points are checked: parse (used by /scrape) and
+    parse_with_links (used by directory crawls) must agree.
+
+    Args:
+        pages: Corpus pages
+
+    Returns:
+        Descriptions of pages whose record count is wrong
+    """
+    problems = []
+    for page in pages:
+        if page['records'] is None:
+            continue
+        scraper = AttorneyScraper(delay=0, extraction_mode=page['mode'])
+        found = {
+            'parse': len(scraper.parse(page['content'], page['url'])),
+            'parse_with_links': len(scraper.parse_with_links(page['content'], page['url'])[0])
+        }
+        for entry_point, count in found.items():
+            if count != page['records']:
+                problems.append(f"{page['name']}: {entry_point} found {count} record(s), expected {page['records']}")
+    return problems
+
+
+def best_time(func: Callable, rounds: int) -> float:
+    """Fastest of ``rounds`` runs of func, in seconds."""
+    times = []
+    for _ in range(rounds):
+        # Each round starts with a cold phone cache, like a fresh process
+        _normalize_key.cache_clear()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_pages(pages: List[Dict], rounds: int) -> Dict:
+    """
+    Time full extraction (AttorneyScraper.parse) of every page.
+
+    Args:
+        pages: Corpus pages
+        rounds: Repetitions per page; the fastest is kept
+
+    Returns:
+        Dictionary with per-page seconds and records, and overall pages/sec
+    """
+    results = {}
+    for page in pages:
+        scraper = AttorneyScraper(delay=0, extraction_mode=page['mode'])
+        records = scraper.parse(page['content'], page['url'])
+        seconds = best_time(lambda: scraper.parse(page['content'], page['url']), rounds)
+        results[page['name']] = {
+            'bytes': len(page['content']),
+            'records': len(records),
+            'seconds': seconds
+        }
+
+    total = sum(result['seconds'] for result in results.values())
+    return {
+        'pages': results,
+        'pages_per_sec': len(pages) / total if total else 0.0
+    }
+
+
+def bench_extractors(pages: List[Dict], rounds: int) -> Dict[str, float]:
+    """
+    Time each extraction step separately, summed over the corpus.
+
+    Steps run on the tree and index they would normally share, so the
+    per-extractor numbers add up to roughly the cost of a page without
+    structured data.
+
+    Args:
+        pages: Corpus pages
+        rounds: Repetitions; the fastest total per step is kept
+
+    Returns:
+        Dictionary of step name -> seconds
+    """
+    totals: Dict[str, List[float]] = {}
+
+    for _ in range(rounds):
+        _normalize_key.cache_clear()
+        round_totals: Dict[str, float] = {}
+
+        def timed(step: str, func: Callable, *args):
+            start = time.perf_counter()
+            result = func(*args)
+            round_totals[step] = round_totals.get(step, 0.0) + time.perf_counter() - start
+            return result
+
+        for page in pages:
+            scraper = AttorneyScraper(delay=0, extraction_mode=page['mode'])
+            content, url = page['content'], page['url']
+
+            timed('json_ld', lambda: find_attorney_entities(extract_json_ld(content)))
+            soup = timed('build_tree', scraper._build_tree, content)
+            index = timed('page_index', PageIndex, soup)
+            timed('page_text', lambda: index.text)
+            timed('_extract_name', scraper._extract_name, index)
+            timed('_extract_phone_numbers', scraper._extract_phone_numbers, index)
+            timed('_extract_email', scraper._extract_email, index)
+            timed('_extract_address', scraper._extract_address, index)
+            timed('_extract_practice_areas', scraper._extract_practice_areas, index)
+            timed('_extract_website', scraper._extract_website, index, url)
+            if page['mode'] != 'profile':
+                timed('_extract_roster', scraper._extract_roster, soup, index, url)
+            soup.decompose()
+
+        for step, seconds in round_totals.items():
+            totals.setdefault(step, []).append(seconds)
+
+    return {step: min(samples) for step, samples in totals.items()}
+
+
+def bench_memory(pages: List[Dict]) -> Dict[str, int]:
+    """
+    Peak memory allocated while extracting each page.
+
+    Args:
+        pages: Corpus pages
+
+    Returns:
+        Dictionary of page name -> peak bytes
+    """
+    peaks = {}
+    for page in pages:
+        scraper = AttorneyScraper(delay=0, extraction_mode=page['mode'])
+        _normalize_key.cache_clear()
+        tracemalloc.start()
+        try:
+            scraper.parse(page['content'], page['url'])
+            peaks[page['name']] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return peaks
+
+
+class CorpusServer:
+    """Local HTTP stand-in serving corpus pages from memory."""
+
+    def __init__(self, pages: List[Dict]):
+        """
+        Start the server on a free localhost port.
+
+        Args:
+            pages: Corpus pages; each is served at /<name>
+        """
+        bodies = {'/' + page['name']: page['content'] for page in pages}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = bodies.get(self.path.split('?')[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, name: str, query: str = '') -> str:
+        """URL of a corpus page on this server."""
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/{name}" + (f"?{query}" if query else '')
+
+    def close(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def bench_http(pages: List[Dict], rounds: int, concurrency: int) -> Dict:
+    """
+    Crawl the corpus end to end through a local HTTP server.
+
+    Every page is requested ``rounds`` times (with distinct query strings)
+    through AttorneyScraper.crawl with no politeness delay, so the result
+    covers fetching, streaming and extraction together.
+
+    Args:
+        pages: Corpus pages
+        rounds: Times each page is fetched
+        concurrency: Requests in flight at once
+
+    Returns:
+        Dictionary with pages/sec, MB/sec and record count
+    """
+    server = CorpusServer(pages)
+    try:
+        urls = [server.url(page['name'], f"r={i}") for i in range(rounds) for page in pages]
+        # The local server is one host; 'auto' extracts rosters and profiles alike
+        scraper = AttorneyScraper(delay=0, max_concurrency=concurrency, extraction_mode='auto')
+
+        async def run() -> int:
+            return len([record async for record in scraper.crawl(urls)])
+
+        start = time.perf_counter()
+        records = asyncio.run(run())
+        seconds = time.perf_counter() - start
+    finally:
+        server.close()
+
+    total_bytes = sum(len(page['content']) for page in pages) * rounds
+    return {
+        'pages_per_sec': len(urls) / seconds,
+        'mb_per_sec': total_bytes / seconds / (1024 * 1024),
+        'records': records
+    }
+
+
+def find_regressions(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        Human-readable descriptions of every regressed metric
+    """
+    regressions = []
+
+    def lower_is_better(label: str, new: Optional[float], old: Optional[float], floor: float = 0.0):
+        if new is None or old is None or max(new, old) < floor:
+            return
+        if new > old * (1 + tolerance):
+            regressions.append(f"{label}: {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+
+    def higher_is_better(label: str, new: Optional[float], old: Optional[float]):
+        if new is None or not old:
+            return
+        if new < old / (1 + tolerance):
+            regressions.append(f"{label}: {old:.4g} -> {new:.4g} (-{(1 - new / old) * 100:.0f}%)")
+
+    old_pages = baseline.get('pages', {}).get('pages', {})
+    for name, page in results['pages']['pages'].items():
+        old = old_pages.get(name)
+        if old:
+            lower_is_better(f"{name} seconds", page['seconds'], old['seconds'], MIN_COMPARABLE_SECONDS)
+            if page['records'] != old['records']:
+                regressions.append(f"{name} records: {old['records']} -> {page['records']}")
+
+    higher_is_better('pages/sec', results['pages']['pages_per_sec'], baseline.get('pages', {}).get('pages_per_sec'))
+
+    old_steps = baseline.get('extractors', {})
+    for step, seconds in results['extractors'].items():
+        lower_is_better(f"{step} seconds", seconds, old_steps.get(step), MIN_COMPARABLE_SECONDS)
+
+    old_memory = baseline.get('memory', {})
+    for name, peak in results['memory'].items():
+        lower_is_better(f"{name} peak memory", peak, old_memory.get(name))
+
+    if 'http' in results and 'http' in baseline:
+        higher_is_better('http pages/sec', results['http']['pages_per_sec'], baseline['http']['pages_per_sec'])
+
+    return regressions
+
+
+def print_report(results: Dict):
+    """Print benchmark results as tables."""
+    print(f"{'page':<20} {'KB':>8} {'records':>8} {'ms':>9} {'peak KB':>9}")
+    for name, page in results['pages']['pages'].items():
+        print(f"{name:<20} {page['bytes'] / 1024:>8.1f} {page['records']:>8} "
+              f"{page['seconds'] * 1000:>9.2f} {results['memory'][name] / 1024:>9.0f}")
+    print(f"\nExtraction: {results['pages']['pages_per_sec']:.1f} pages/sec")
+
+    print(f"\n{'step':<26} {'ms':>9}")
+    for step, seconds in results['extractors'].items():
+        print(f"{step:<26} {seconds * 1000:>9.2f}")
+
+    if 'http' in results:
+        http = results['http']
+        print(f"\nHTTP crawl: {http['pages_per_sec']:.1f} pages/sec, "
+              f"{http['mb_per_sec']:.1f} MB/sec, {http['records']} records")
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark attorney extraction over the recorded corpus")
+    parser.add_argument('--rounds', type=int, default=5, help="repetitions per measurement (default 5)")
+    parser.add_argument('--http', action='store_true', help="also measure end-to-end fetch throughput")
+    parser.add_argument('--concurrency', type=int, default=8, help="in-flight requests for --http (default 8)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline file to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true', help="save this run as the baseline")
+    parser.add_argument('--check', action='store_true', help="only check record counts, without timing")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before flagging (default 0.25)")
+    args = parser.parse_args()
+
+    pages = load_corpus()
+    problems = check_records(pages)
+    if problems:
+        print(f"{len(problems)} page(s) extracted wrongly:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    if args.check:
+        print(f"Record counts match for all {len(pages)} pages")
+        return
+
+    results = {
+        'pages': bench_pages(pages, args.rounds),
+        'extractors': bench_extractors(pages, args.rounds),
+        'memory': bench_memory(pages)
+    }
+    if args.http:
+        results['http'] = bench_http(pages, args.rounds, args.concurrency)
+
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline to compare with; run with --save-baseline first")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Import-time report for the bot's cold start.
+
+Imports a module in fresh interpreters with `python -X importtime` and
+reports what each imported module costs: the total, the most expensive
+modules by self time and the cost of each top-level package. With a
+budget the script exits non-zero when the import is slower, and --forbid
+fails it when a module that should load lazily is imported at startup.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 400 --forbid bs4,requests,phonenumbers
+    python benchmarks/import_time.py bot_handlers --top 30
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import List, Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(BENCH_DIR, '..')
+SRC_DIR = os.path.join(PROJECT_DIR, 'src')
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)\s*$')
+
+
+def measure_imports(module: str) -> List[Dict]:
+    """
+    Import a module in a fresh interpreter and record every import.
+
+    Args:
+        module: Dotted module name, importable with the project root and
+            src on the path
+
+    Returns:
+        List of dictionaries with 'name', 'self_us' and 'cumulative_us',
+        in the order imports finished
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([PROJECT_DIR, SRC_DIR, env.get('PYTHONPATH', '')])
+    # The webhook refuses to load without a token; importing never uses it
+    env.setdefault('TELEGRAM_BOT_TOKEN', '0:import-time-report')
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            imports.append({
+                'name': name,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us)
+            })
+    return imports
+
+
+def best_of(runs: List[List[Dict]]) -> Dict[str, Dict]:
+    """
+    Combine runs, keeping each module's fastest time to drop scheduling noise.
+
+    Args:
+        runs: Results of measure_imports
+
+    Returns:
+        Dictionary of module name -> import record
+    """
+    modules = {}
+    for imports in runs:
+        for record in imports:
+            best = modules.get(record['name'])
+            if best is None or record['self_us'] < best['self_us']:
+                modules[record['name']] = dict(record)
+    return modules
+
+
+def package_costs(modules: Dict[str, Dict]) -> Dict[str, int]:
+    """Self time summed per top-level package, in microseconds, largest first."""
+    costs: Dict[str, int] = {}
+    for name, record in modules.items():
+        package = name.split('.')[0]
+        costs[package] = costs.get(package, 0) + record['self_us']
+    return dict(sorted(costs.items(), key=lambda item: -item[1]))
+
+
+def print_report(module: str, modules: Dict[str, Dict], top: int):
+    """Print the import report as tables."""
+    total_us = sum(record['self_us'] for record in modules.values())
+    print(f"Importing {module}: {total_us / 1000:.1f} ms, {len(modules)} modules\n")
+
+    print(f"{'module':<44} {'self ms':>9} {'cumul ms':>9}")
+    slowest = sorted(modules.values(), key=lambda record: -record['self_us'])[:top]
+    for record in slowest:
+        print(f"{record['name']:<44} {record['self_us'] / 1000:>9.2f} {record['cumulative_us'] / 1000:>9.2f}")
+
+    print(f"\n{'package':<44} {'ms':>9} {'share':>9}")
+    for package, cost_us in list(package_costs(modules).items())[:top]:
+        print(f"{package:<44} {cost_us / 1000:>9.2f} {cost_us / max(total_us, 1):>9.0%}")
+
+
+def main():
+    """Run the import-time report."""
+    parser = argparse.ArgumentParser(description="Report per-module import cost of a cold start")
+    parser.add_argument('module', nargs='?', default='api.webhook',
+                        help="module to import (default api.webhook)")
+    parser.add_argument('--rounds', type=int, default=5, help="fresh interpreters to run (default 5)")
+    parser.add_argument('--top', type=int, default=20, help="rows per table (default 20)")
+    parser.add_argument('--budget-ms', type=float, help="fail if the import takes longer")
+    parser.add_argument('--forbid', default='',
+                        help="comma-separated modules that must not be imported at startup")
+    args = parser.parse_args()
+
+    modules = best_of([measure_imports(args.module) for _ in range(args.rounds)])
+    print_report(args.module, modules, args.top)
+
+    failures = []
+    total_ms = sum(record['self_us'] for record in modules.values()) / 1000
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    for name in filter(None, (name.strip() for name in args.forbid.split(','))):
+        if name in modules:
+            failures.append(f"{name} is imported at startup")
+
+    if failures:
+        print(f"\n{len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+    if args.budget_ms is not None:
+        print(f"\nWithin the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@
 // State
 let currentUser = null;
 
+// Radius for ZIP code searches, in miles
+const SEARCH_RADIUS_MILES = 10;
+
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
     initializeApp();
@@ -120,7 +123,11 @@ function handleSearch(e) {
 
     // Build query string
     const params = new URLSearchParams();
-    if (zip) params.append('zip', zip);
+    if (zip) {
+        params.append('zip', zip);
+        // Full ZIP codes also match nearby attorneys, nearest first
+        if (/^\d{5}$/.test(zip)) params.append('radius', SEARCH_RADIUS_MILES);
+    }
     if (city) params.append('city', city);
     if (practice) params.append('practice', practice);
 
@@ -197,6 +204,13 @@ function displayResults(results) {
                     </div>
                 ` : ''}
 
+                ${attorney.distance_miles != null ? `
+                    <div>
+                        <strong>📏 Distance:</strong>
+                        <span>${attorney.distance_miles.toFixed(1)} mi</span>
+                    </div>
+                ` : ''}
+
                 ${attorney.practice_areas ? `
                     <div>
                         <strong>⚖️ Practice:</strong>
@@ -0,0 +1,114 @@
+"""
+Awaitable access to the attorney database for the bot's async handlers.
+
+sqlite3 calls block, and a handler that queries the database directly
+stalls the event loop serving every chat. AsyncAttorneyDatabase runs each
+call on a dedicated thread pool instead. Every worker thread keeps its own
+persistent connection (see db_connection), so reads run in parallel under
+WAL. Writes go to a single writer thread: SQLite allows one writer at a
+time anyway, and a bulk insert then never occupies the read workers.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from database import AttorneyDatabase
+
+
+DEFAULT_READ_WORKERS = 4
+
+
+class AsyncAttorneyDatabase:
+    """Runs AttorneyDatabase calls on bounded worker threads and exposes them as awaitables."""
+
+    def __init__(self, db: AttorneyDatabase, read_workers: int = DEFAULT_READ_WORKERS):
+        """
+        Initialize worker threads; each opens its connection on first use.
+
+        Args:
+            db: Database to run calls against
+            read_workers: Number of threads serving reads
+        """
+        self.db = db
+        self.read_workers = read_workers
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=read_workers,
+            thread_name_prefix='db-read'
+        )
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='db-write'
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def search_attorneys(self, **kwargs) -> List[Dict]:
+        """Awaitable AttorneyDatabase.search_attorneys."""
+        return await self._read(self.db.search_attorneys, **kwargs)
+
+    async def search_attorneys_page(self, **kwargs) -> Dict:
+        """Awaitable AttorneyDatabase.search_attorneys_page."""
+        return await self._read(self.db.search_attorneys_page, **kwargs)
+
+    async def get_attorney_by_id(self, attorney_id: int) -> Optional[Dict]:
+        """Awaitable AttorneyDatabase.get_attorney_by_id."""
+        return await self._read(self.db.get_attorney_by_id, attorney_id)
+
+    async def get_attorneys_by_ids(self, attorney_ids: List[int]) -> List[Dict]:
+        """Awaitable AttorneyDatabase.get_attorneys_by_ids."""
+        return await self._read(self.db.get_attorneys_by_ids, attorney_ids)
+
+    async def get_stats(self) -> Dict:
+        """Awaitable AttorneyDatabase.get_stats."""
+        return await self._read(self.db.get_stats)
+
+    async def get_state_counts(self) -> Dict[str, int]:
+        """Awaitable AttorneyDatabase.get_state_counts."""
+        return await self._read(self.db.get_state_counts)
+
+    async def get_practice_area_counts(self) -> Dict[str, int]:
+        """Awaitable AttorneyDatabase.get_practice_area_counts."""
+        return await self._read(self.db.get_practice_area_counts)
+
+    async def get_daily_additions(self, days: int = 30) -> Dict[str, int]:
+        """Awaitable AttorneyDatabase.get_daily_additions."""
+        return await self._read(self.db.get_daily_additions, days)
+
+    async def add_attorney(self, attorney_data: Dict) -> int:
+        """Awaitable AttorneyDatabase.add_attorney."""
+        return await self._write(self.db.add_attorney, attorney_data)
+
+    async def add_attorneys_many(self, attorneys: List[Dict]) -> Dict[str, int]:
+        """Awaitable AttorneyDatabase.add_attorneys_many."""
+        return await self._write(self.db.add_attorneys_many, attorneys)
+
+    def shutdown(self):
+        """Stop the worker threads and close their connections."""
+        self._read_executor.shutdown(wait=True)
+        self._write_executor.shutdown(wait=True)
+        self.db.close()
+
+    async def _read(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a read on the read workers, queueing beyond one call per worker."""
+        loop = asyncio.get_running_loop()
+        # Waiting here rather than in the executor's queue keeps the backlog
+        # on the event loop, where cancelled handlers drop out of it
+        async with self._loop_slots(loop):
+            return await loop.run_in_executor(
+                self._read_executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def _write(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a write on the writer thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._write_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def _loop_slots(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """Return the read semaphore bound to the running loop."""
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.read_workers)
+        return self._slots
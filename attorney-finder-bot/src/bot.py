@@ -8,7 +8,8 @@ import logging
 from telegram.ext import Application
 from dotenv import load_dotenv
 
-from bot_handlers import setup_handlers
+from bot_handlers import setup_handlers, shutdown_handlers, start_scrape_worker, stop_scrape_worker
+from send_scheduler import SendScheduler
 
 # Load environment variables
 load_dotenv()
@@ -28,15 +29,26 @@ def main():
     if not token:
         raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
 
-    # Create application
-    application = Application.builder().token(token).build()
+    # Create application; outbound requests are paced to Telegram's flood
+    # limits, and queued /scrape jobs are worked off alongside polling
+    application = (
+        Application.builder()
+        .token(token)
+        .rate_limiter(SendScheduler())
+        .post_init(start_scrape_worker)
+        .post_stop(stop_scrape_worker)
+        .build()
+    )
 
     # Setup all handlers
     setup_handlers(application)
 
     # Start bot in polling mode
     logger.info("Starting Attorney Finder Bot in polling mode...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    try:
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
+    finally:
+        shutdown_handlers()
 
 
 if __name__ == '__main__':
@@ -2,7 +2,10 @@
 Bot command handlers - separated for reuse in both polling and webhook modes.
 """
 import os
-from telegram import Update
+import asyncio
+import secrets
+import threading
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     CommandHandler,
     MessageHandler,
@@ -13,15 +16,163 @@ from telegram.ext import (
 )
 from dotenv import load_dotenv
 
-from database import AttorneyDatabase
-from scraper import AttorneyScraper
+from practice_areas import practice_area_matcher
 
 # Load environment variables
 load_dotenv()
 
-# Initialize database and scraper
-db = AttorneyDatabase(os.getenv('DATABASE_PATH', 'attorneys.db'))
-scraper = AttorneyScraper(delay=float(os.getenv('SCRAPE_DELAY_SECONDS', '2')))
+# The database and the scraper (with requests, BeautifulSoup, lxml and
+# phonenumbers behind it) are built on first use, so a cold start serving
+# /help or a search never loads the scraping stack
+_db = None
+_scrape_pool = None
+_scrape_jobs = None
+_search_sessions = None
+_scrape_worker = None
+_scrape_worker_task = None
+_init_lock = threading.Lock()
+
+
+def get_db():
+    """
+    Database shared by the handlers, opened on first use.
+
+    Handlers await its calls, which run on worker threads.
+
+    Returns:
+        AsyncAttorneyDatabase instance
+    """
+    global _db
+    with _init_lock:
+        if _db is None:
+            from database import AttorneyDatabase
+            from async_database import AsyncAttorneyDatabase
+
+            natural_key = os.getenv('ATTORNEY_NATURAL_KEY')
+            _db = AsyncAttorneyDatabase(
+                AttorneyDatabase(
+                    os.getenv('DATABASE_PATH', 'attorneys.db'),
+                    natural_key=natural_key.split(',') if natural_key else None
+                ),
+                read_workers=int(os.getenv('DB_READ_WORKERS', '4'))
+            )
+        return _db
+
+
+def get_scrape_pool():
+    """
+    Scrape worker pool shared by the handlers, built on first use.
+
+    Returns:
+        ScrapeWorkerPool instance
+    """
+    global _scrape_pool
+    with _init_lock:
+        if _scrape_pool is None:
+            from scraper import AttorneyScraper
+            from http_cache import ResponseCache
+            from scrape_pool import ScrapeWorkerPool
+
+            scrape_cache = None
+            if os.getenv('SCRAPE_CACHE_PATH'):
+                scrape_cache = ResponseCache(
+                    os.getenv('SCRAPE_CACHE_PATH'),
+                    max_bytes=int(os.getenv('SCRAPE_CACHE_MAX_MB', '200')) * 1024 * 1024
+                )
+            scraper = AttorneyScraper(
+                delay=float(os.getenv('SCRAPE_DELAY_SECONDS', '2')),
+                cache=scrape_cache,
+                extraction_mode=os.getenv('SCRAPE_MODE', 'auto'),
+                max_page_bytes=int(float(os.getenv('SCRAPE_MAX_PAGE_MB', '5')) * 1024 * 1024)
+            )
+            _scrape_pool = ScrapeWorkerPool(
+                scraper,
+                io_workers=int(os.getenv('SCRAPE_IO_WORKERS', '4')),
+                parse_workers=int(os.getenv('SCRAPE_PARSE_WORKERS', '2'))
+            )
+        return _scrape_pool
+
+
+def get_scrape_jobs():
+    """
+    Queue of /scrape jobs, opened on first use.
+
+    Returns:
+        ScrapeJobQueue instance
+    """
+    global _scrape_jobs
+    with _init_lock:
+        if _scrape_jobs is None:
+            from scrape_jobs import ScrapeJobQueue
+
+            _scrape_jobs = ScrapeJobQueue(os.getenv('DATABASE_PATH', 'attorneys.db'))
+        return _scrape_jobs
+
+
+def get_search_sessions():
+    """
+    Store of the searches whose Prev/Next buttons still work, opened on first use.
+
+    Sessions live in the database rather than in this process, so a page
+    turn served by another webhook instance still finds its search.
+
+    Returns:
+        SearchSessionStore instance
+    """
+    global _search_sessions
+    with _init_lock:
+        if _search_sessions is None:
+            from search_sessions import SearchSessionStore
+
+            _search_sessions = SearchSessionStore(
+                os.getenv('DATABASE_PATH', 'attorneys.db'),
+                ttl_seconds=float(os.getenv('SEARCH_SESSION_TTL_SECONDS', '3600'))
+            )
+        return _search_sessions
+
+
+async def start_scrape_worker(application: Application):
+    """
+    Drain the scrape job queue in this process (polling mode).
+
+    Args:
+        application: Initialized Application whose bot sends the notifications
+    """
+    global _scrape_worker, _scrape_worker_task
+    from scrape_jobs import ScrapeJobWorker
+
+    _scrape_worker = ScrapeJobWorker(
+        get_scrape_jobs(),
+        get_scrape_pool(),
+        get_db(),
+        application.bot,
+        concurrency=int(os.getenv('SCRAPE_JOB_WORKERS', '2'))
+    )
+    _scrape_worker_task = asyncio.create_task(_scrape_worker.run())
+
+
+async def stop_scrape_worker(application: Application):
+    """Stop the in-process scrape worker; jobs it was running are requeued."""
+    global _scrape_worker, _scrape_worker_task
+    if _scrape_worker_task is not None:
+        _scrape_worker_task.cancel()
+        try:
+            await _scrape_worker_task
+        except asyncio.CancelledError:
+            pass
+    _scrape_worker = _scrape_worker_task = None
+
+
+# URLs one /scrape command may queue
+MAX_URLS_PER_SCRAPE = int(os.getenv('MAX_URLS_PER_SCRAPE', '20'))
+
+# Results fetched from the database at a time
+SEARCH_PAGE_SIZE = int(os.getenv('MAX_RESULTS_PER_SEARCH', '50'))
+# Results shown in a search's message; Prev/Next flip through them in place
+RESULTS_PER_MESSAGE = 5
+# ZIP code searches find attorneys within this distance unless the query
+# gives one ("94621 within 5 miles")
+SEARCH_RADIUS_MILES = float(os.getenv('SEARCH_RADIUS_MILES', '10'))
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -33,7 +184,7 @@ I help you find legal counsel quickly and easily.
 
 *Available Commands:*
 /search - Search for attorneys
-/scrape <url> - Add attorney from URL
+/scrape <url> - Add attorneys from one or more URLs
 /stats - View database statistics
 /help - Show this message
 
@@ -61,6 +212,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
    • `Oakland` - Search by city
    • `family law` - Search by practice area
    • `94621 divorce` - Combine location + practice area
+   • `94621 within 5 miles` - Search around a ZIP code
 
 2️⃣ */search* command:
    • `/search 94621` - ZIP code search
@@ -69,7 +221,8 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 3️⃣ *Add Attorney* from URL:
    • `/scrape https://example.com/attorney/john-doe`
-   • Bot will extract contact info automatically
+   • Send several URLs in one command to queue them all
+   • Bot will extract contact info and message you when each is done
 
 *Other Commands:*
 /stats - View database statistics
@@ -87,7 +240,16 @@ Need help? Just ask!
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show database statistics."""
-    stats = db.get_stats()
+    db = get_db()
+    stats, state_counts, practice_area_counts, daily_additions = await asyncio.gather(
+        db.get_stats(),
+        db.get_state_counts(),
+        db.get_practice_area_counts(),
+        db.get_daily_additions(1)
+    )
+    top_states = list(state_counts.items())[:5]
+    top_practice_areas = list(practice_area_counts.items())[:5]
+    last_day = next(iter(daily_additions.items()), None)
 
     stats_text = f"""
 📊 *Database Statistics*
@@ -95,65 +257,68 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 👨‍⚖️ Total Attorneys: {stats['total_attorneys']}
 🏙️ Unique Cities: {stats['unique_cities']}
 🗺️ Unique States: {stats['unique_states']}
+"""
 
-Keep adding more attorneys to grow the database!
-    """
+    if top_states:
+        stats_text += "\n*Top States:*\n"
+        stats_text += "\n".join(f"• {state}: {count}" for state, count in top_states) + "\n"
+
+    if top_practice_areas:
+        stats_text += "\n*Top Practice Areas:*\n"
+        stats_text += "\n".join(f"• {area}: {count}" for area, count in top_practice_areas) + "\n"
+
+    if last_day:
+        stats_text += f"\n📅 Last added: {last_day[1]} on {last_day[0]}\n"
+
+    stats_text += "\nKeep adding more attorneys to grow the database!"
     await update.message.reply_text(stats_text, parse_mode='Markdown')
 
 
 async def scrape_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Scrape attorney data from a URL."""
+    """Queue attorney pages to scrape; the user is messaged as each finishes."""
     if not context.args:
         await update.message.reply_text(
             "Please provide a URL to scrape.\n\n"
-            "Usage: `/scrape https://example.com/attorney/john-doe`",
+            "Usage: `/scrape https://example.com/attorney/john-doe`\n"
+            f"Send up to {MAX_URLS_PER_SCRAPE} URLs at once, separated by spaces or new lines.",
             parse_mode='Markdown'
         )
         return
 
-    url = context.args[0]
-
-    # Validate URL
-    if not url.startswith(('http://', 'https://')):
-        await update.message.reply_text("Please provide a valid URL starting with http:// or https://")
+    # Validate URLs, dropping repeats
+    urls = list(dict.fromkeys(context.args))
+    invalid = [url for url in urls if not url.startswith(('http://', 'https://'))]
+    if invalid:
+        await update.message.reply_text(
+            "Please provide valid URLs starting with http:// or https://\n\n"
+            "Not a URL: " + ", ".join(invalid[:5]),
+            disable_web_page_preview=True
+        )
         return
 
-    # Send processing message
-    processing_msg = await update.message.reply_text("🔍 Scraping attorney information...")
+    if len(urls) > MAX_URLS_PER_SCRAPE:
+        await update.message.reply_text(
+            f"Please send at most {MAX_URLS_PER_SCRAPE} URLs at a time (got {len(urls)})."
+        )
+        return
 
     try:
-        # Scrape the URL
-        attorneys = scraper.scrape_url(url)
-
-        if not attorneys:
-            await processing_msg.edit_text(
-                "❌ Could not extract attorney information from this URL.\n\n"
-                "Please make sure the URL contains attorney contact details."
-            )
-            return
-
-        # Add to database
-        added_count = 0
-        for attorney_data in attorneys:
-            if attorney_data.get('name') or attorney_data.get('phone'):
-                db.add_attorney(attorney_data)
-                added_count += 1
-
-        if added_count > 0:
-            await processing_msg.edit_text(
-                f"✅ Successfully added {added_count} attorney(s) to the database!\n\n"
-                f"Use /search to find them."
-            )
-        else:
-            await processing_msg.edit_text(
-                "⚠️ No valid attorney information found at this URL."
-            )
-
+        await asyncio.to_thread(get_scrape_jobs().enqueue, urls, update.effective_chat.id)
     except Exception as e:
-        await processing_msg.edit_text(
-            f"❌ Error scraping URL: {str(e)}\n\n"
+        await update.message.reply_text(
+            f"❌ Error queueing URL(s): {str(e)}\n\n"
             f"Please try again or contact support."
         )
+        return
+
+    if _scrape_worker is not None:
+        _scrape_worker.wake()
+
+    if len(urls) == 1:
+        text = "📥 Queued for scraping. I'll message you when it's done."
+    else:
+        text = f"📥 Queued {len(urls)} URLs for scraping. I'll message you as each one finishes."
+    await update.message.reply_text(text)
 
 
 async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -171,7 +336,7 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     query = ' '.join(context.args)
-    await perform_search(update, query)
+    await perform_search(update, query, context)
 
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -183,27 +348,25 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Perform search
-    await perform_search(update, query)
+    await perform_search(update, query, context)
 
 
-async def perform_search(update: Update, query: str):
-    """Perform attorney search and send results."""
+async def perform_search(update: Update, query: str, context: ContextTypes.DEFAULT_TYPE):
+    """Perform attorney search and send the first page of results."""
     # Parse query
     search_params = parse_search_query(query)
 
-    # Send searching message
-    searching_msg = await update.message.reply_text(f"🔍 Searching for attorneys...")
+    session = {
+        'params': search_params,
+        'ids': [],
+        'distances': {},
+        'cursor': None,
+        'done': False
+    }
+    await load_results(session, RESULTS_PER_MESSAGE + 1)
 
-    # Search database
-    results = db.search_attorneys(
-        city=search_params.get('city'),
-        zip_code=search_params.get('zip_code'),
-        practice_area=search_params.get('practice_area'),
-        limit=50
-    )
-
-    if not results:
-        await searching_msg.edit_text(
+    if not session['ids']:
+        await update.message.reply_text(
             "❌ No attorneys found matching your search.\n\n"
             "Try:\n"
             "• Different location or practice area\n"
@@ -212,17 +375,71 @@ async def perform_search(update: Update, query: str):
         )
         return
 
-    # Format and send results
-    await searching_msg.edit_text(
-        f"✅ Found {len(results)} attorney(s)!\n\n"
-        f"Sending results..."
-    )
+    # Buttons carry the session id; flipping pages reads the session, not
+    # the search
+    search_id = secrets.token_urlsafe(6)
+    await asyncio.to_thread(get_search_sessions().save, search_id, session)
+
+    text, keyboard = await render_results_page(search_id, session, 0)
+    await update.message.reply_text(text, parse_mode='Markdown', reply_markup=keyboard)
+
 
-    # Send results in batches
-    for i in range(0, len(results), 5):
-        batch = results[i:i+5]
-        message = format_results(batch, i+1)
-        await update.message.reply_text(message, parse_mode='Markdown')
+async def load_results(session: dict, count: int):
+    """
+    Extend a search session's result IDs until it holds count or the search is exhausted.
+
+    Continues the search from the session's cursor, one database page at a time.
+
+    Args:
+        session: Search session from perform_search
+        count: Number of result IDs wanted
+    """
+    search_params = session['params']
+    while len(session['ids']) < count and not session['done']:
+        page = await get_db().search_attorneys_page(
+            city=search_params.get('city'),
+            zip_code=search_params.get('zip_code'),
+            practice_area=search_params.get('practice_area'),
+            page_size=SEARCH_PAGE_SIZE,
+            cursor=session['cursor'],
+            radius_miles=search_params.get('radius_miles')
+        )
+        for attorney in page['results']:
+            session['ids'].append(attorney['id'])
+            if attorney.get('distance_miles') is not None:
+                session['distances'][attorney['id']] = attorney['distance_miles']
+        session['cursor'] = page['next_cursor']
+        session['done'] = page['next_cursor'] is None
+
+
+async def render_results_page(search_id: str, session: dict, page: int):
+    """
+    Build the text and Prev/Next keyboard of one page of a search session.
+
+    Args:
+        search_id: Id of the session in the search session store
+        session: Search session with the page's result IDs loaded
+        page: Zero-based page number
+
+    Returns:
+        Tuple of (Markdown text, InlineKeyboardMarkup or None)
+    """
+    start = page * RESULTS_PER_MESSAGE
+    attorneys = await get_db().get_attorneys_by_ids(session['ids'][start:start + RESULTS_PER_MESSAGE])
+    for attorney in attorneys:
+        attorney['distance_miles'] = session['distances'].get(attorney['id'])
+
+    end = start + len(attorneys)
+    total = f" of {len(session['ids'])}" if session['done'] else ""
+    text = f"✅ Attorneys {start + 1}–{end}{total}\n\n" + format_results(attorneys, start + 1)
+
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"results:{search_id}:{page - 1}"))
+    if len(session['ids']) > start + RESULTS_PER_MESSAGE or not session['done']:
+        buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"results:{search_id}:{page + 1}"))
+
+    return text, InlineKeyboardMarkup([buttons]) if buttons else None
 
 
 def parse_search_query(query: str) -> dict:
@@ -231,27 +448,27 @@ def parse_search_query(query: str) -> dict:
 
     params = {}
 
+    # Check for a search radius ("within 5 miles", "5mi")
+    radius_match = re.search(r'\b(?:within\s+)?(\d+(?:\.\d+)?)\s*(?:mi|miles?)\b', query, re.IGNORECASE)
+    radius = SEARCH_RADIUS_MILES
+    if radius_match:
+        radius = float(radius_match.group(1))
+        query = ' '.join(query.replace(radius_match.group(0), ' ').split())
+
     # Check for ZIP code (5 digits)
     zip_match = re.search(r'\b(\d{5})\b', query)
     if zip_match:
         params['zip_code'] = zip_match.group(1)
+        if radius > 0:
+            params['radius_miles'] = radius
         query = query.replace(zip_match.group(0), '').strip()
 
-    # Common practice areas
-    practice_areas = [
-        'criminal', 'family', 'divorce', 'personal injury', 'dui', 'dwi',
-        'immigration', 'bankruptcy', 'estate planning', 'real estate',
-        'business', 'corporate', 'employment', 'civil', 'litigation',
-        'medical malpractice', 'workers compensation', 'tax', 'intellectual property'
-    ]
-
-    # Check for practice area
-    query_lower = query.lower()
-    for area in practice_areas:
-        if area in query_lower:
-            params['practice_area'] = area
-            query = query.replace(area, '').replace(area.title(), '').strip()
-            break
+    # Check for practice area (terms and synonyms from the shared taxonomy)
+    practice_match = practice_area_matcher.search(query)
+    if practice_match:
+        area, start, end = practice_match
+        params['practice_area'] = area
+        query = ' '.join((query[:start] + ' ' + query[end:]).split())
 
     # Remaining text is likely city
     if query.strip():
@@ -289,6 +506,8 @@ def format_results(attorneys: list, start_num: int = 1) -> str:
         if email != 'N/A':
             message += f"📧 Email: {email}\n"
         message += f"📍 Location: {location}\n"
+        if attorney.get('distance_miles') is not None:
+            message += f"📏 Distance: {attorney['distance_miles']:.1f} mi\n"
         message += f"⚖️ Practice: {practice_areas}\n"
         if website != 'N/A':
             message += f"🌐 Website: {website}\n"
@@ -300,10 +519,40 @@ def format_results(attorneys: list, start_num: int = 1) -> str:
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle button callbacks."""
     query = update.callback_query
+    action, _, argument = (query.data or '').partition(':')
+
+    if action == 'results':
+        await results_page_callback(query, argument)
+        return
+
     await query.answer()
 
-    # Handle different callback actions here
-    # For future expansion
+
+async def results_page_callback(query, argument: str):
+    """Show another page of a search by editing its message in place."""
+    search_id, _, page = argument.partition(':')
+    session = None
+    if page.isdigit():
+        session = await asyncio.to_thread(get_search_sessions().get, search_id)
+    if session is None:
+        await query.answer("This search has expired. Please send it again.", show_alert=True)
+        return
+
+    page = int(page)
+    # One ID past the page tells whether to offer Next. Concurrent flips of
+    # the same search each extend their own copy from the same cursor, so
+    # whichever saves last stores the same results
+    await load_results(session, (page + 1) * RESULTS_PER_MESSAGE + 1)
+    if page * RESULTS_PER_MESSAGE >= len(session['ids']):
+        await query.answer("No more results.")
+        return
+
+    # Flipping pages keeps the session alive
+    await asyncio.to_thread(get_search_sessions().save, search_id, session)
+
+    await query.answer()
+    text, keyboard = await render_results_page(search_id, session, page)
+    await query.edit_message_text(text, parse_mode='Markdown', reply_markup=keyboard)
 
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -333,3 +582,16 @@ def setup_handlers(application: Application):
 
     # Add error handler
     application.add_error_handler(error_handler)
+
+
+def shutdown_handlers():
+    """Stop the scrape and database workers and close database connections."""
+    global _db, _scrape_pool, _scrape_jobs
+    with _init_lock:
+        _scrape_jobs = None
+        if _scrape_pool is not None:
+            _scrape_pool.shutdown()
+            _scrape_pool = None
+        if _db is not None:
+            _db.shutdown()
+            _db = None
@@ -1,22 +1,105 @@
 """
 Database module for storing and retrieving attorney information.
 """
+import os
+import re
+import json
+import math
+import base64
+import hashlib
 import sqlite3
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterable
 from datetime import datetime
 
+from db_connection import ConnectionManager
+from geo import ZIP_CENTROIDS_PATH, bounding_box, haversine_miles, read_zip_centroids
+from practice_areas import PRACTICE_AREA_TAXONOMY, practice_area_matcher
+from query_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, QueryCache
+
+
+# Attorney fields written by add_attorney / add_attorneys_many
+ATTORNEY_FIELDS = [
+    'name', 'phone', 'email', 'website', 'address', 'city', 'state',
+    'zip_code', 'practice_areas', 'source_url'
+]
+
+# Fields that can make up the natural key records are deduplicated on. A
+# roster page lists many attorneys under one source_url, so the default
+# key pairs it with the name.
+NATURAL_KEY_FIELDS = ['source_url', 'name', 'email', 'phone', 'website']
+DEFAULT_NATURAL_KEY = ['source_url', 'name']
+
+
+# Columns in the full-text index and their BM25 weights; a match in the
+# name counts for more than one in the street address
+FTS_COLUMNS = ['name', 'city', 'practice_areas', 'address', 'zip_code']
+FTS_WEIGHTS = [10.0, 5.0, 3.0, 1.0, 1.0]
+
+FTS_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Filter on an attorney's normalized practice areas (an index seek on the
+# join table's primary key)
+PRACTICE_AREA_FILTER = '''
+    EXISTS (
+        SELECT 1 FROM attorney_practice_areas ap
+        WHERE ap.attorney_id = a.id AND ap.practice_area_id = ?
+    )
+'''
+
+# Columns with per-value statistics: dimension -> (column, attorney_stats
+# counter of distinct values)
+STAT_COLUMNS = {
+    'city': ('city', 'unique_cities'),
+    'state': ('state', 'unique_states'),
+}
+
 
 class AttorneyDatabase:
     """Manages SQLite database for attorney information."""
 
-    def __init__(self, db_path: str = "attorneys.db"):
-        """Initialize database connection and create tables if needed."""
+    def __init__(
+        self,
+        db_path: str = "attorneys.db",
+        natural_key: Optional[Iterable[str]] = None,
+        search_cache_size: int = DEFAULT_MAX_ENTRIES,
+        search_cache_ttl: float = DEFAULT_TTL_SECONDS
+    ):
+        """
+        Initialize database connection and create tables if needed.
+
+        Args:
+            db_path: Path to SQLite database file
+            natural_key: Fields identifying the same attorney across
+                scrapes (from NATURAL_KEY_FIELDS). The key is stored in the
+                database; None keeps the stored key (source_url + name for
+                a new database), and a different key re-keys existing rows
+            search_cache_size: Search result pages to cache (0 disables
+                the cache)
+            search_cache_ttl: Seconds a cached page stays valid
+        """
+        if natural_key is not None:
+            natural_key = list(natural_key)
+            unknown = [field for field in natural_key if field not in NATURAL_KEY_FIELDS]
+            if not natural_key or unknown:
+                raise ValueError(f"natural_key fields must be from {', '.join(NATURAL_KEY_FIELDS)}")
+
         self.db_path = db_path
+        self.connections = ConnectionManager(
+            db_path, functions={'haversine_miles': (4, haversine_miles)}
+        )
+        self.natural_key = natural_key
+        self.fts_enabled = False
+        self.geo_enabled = False
+        self.search_cache = QueryCache(search_cache_size, search_cache_ttl)
         self.init_database()
 
+    def close(self):
+        """Close all persistent connections."""
+        self.connections.close_all()
+
     def init_database(self):
         """Create database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connections.get()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -32,6 +115,7 @@ class AttorneyDatabase:
                 zip_code TEXT,
                 practice_areas TEXT,
                 source_url TEXT,
+                dedup_key TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -45,131 +129,1385 @@ class AttorneyDatabase:
             CREATE INDEX IF NOT EXISTS idx_zip ON attorneys(zip_code)
         ''')
 
+        # Full 5-digit ZIP searches walk this newest first, so their pages
+        # need no sort (stored codes may carry a +4 suffix)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_zip5_id ON attorneys(substr(zip_code, 1, 5), id)
+        ''')
+
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_name ON attorneys(name)
         ''')
 
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS database_settings (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
         conn.commit()
-        conn.close()
+
+        self._init_practice_areas(conn)
+        self._init_stats(conn)
+        self.geo_enabled = self._init_geo(conn)
+        self.fts_enabled = self._init_fts(conn)
+        self._init_write_generation(conn)
+        self._init_natural_key(conn)
+
+    def _init_natural_key(self, conn: sqlite3.Connection):
+        """
+        Add the dedup_key column and its unique index, keyed on natural_key.
+
+        When the column is new or the configured key differs from the
+        stored one, every row is re-keyed. Rows that turn out to share a
+        key are merged into the oldest one (keeping its id and created_at,
+        taking the newest non-empty value of each field) and the others
+        are deleted, so the unique index can be built.
+
+        Args:
+            conn: Connection to migrate on
+        """
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(attorneys)")
+        has_column = any(row[1] == 'dedup_key' for row in cursor.fetchall())
+
+        cursor.execute("SELECT value FROM database_settings WHERE name = 'natural_key'")
+        row = cursor.fetchone()
+        stored_key = row[0].split(',') if row else None
+
+        if self.natural_key is None:
+            self.natural_key = stored_key or DEFAULT_NATURAL_KEY
+        if has_column and stored_key == self.natural_key:
+            return
+
+        with conn:
+            if not has_column:
+                cursor.execute("ALTER TABLE attorneys ADD COLUMN dedup_key TEXT")
+            cursor.execute("DROP INDEX IF EXISTS idx_dedup_key")
+
+            columns = ', '.join(ATTORNEY_FIELDS)
+            cursor.execute(f"SELECT id, {columns}, updated_at FROM attorneys ORDER BY id")
+
+            keep: Dict[str, Dict] = {}
+            merged: Dict[int, Dict] = {}
+            duplicates = []
+            keys = []
+            for row in cursor.fetchall():
+                record = dict(zip(['id'] + ATTORNEY_FIELDS + ['updated_at'], row))
+                key = _dedup_key(record, self.natural_key)
+                keys.append((key, record['id']))
+                if key is None:
+                    continue
+                if key not in keep:
+                    keep[key] = record
+                    continue
+
+                # Later rows are newer scrapes of the same attorney
+                kept = keep[key]
+                for field in ATTORNEY_FIELDS + ['updated_at']:
+                    if record[field]:
+                        kept[field] = record[field]
+                merged[kept['id']] = kept
+                duplicates.append((record['id'],))
+
+            cursor.executemany("DELETE FROM attorneys WHERE id = ?", duplicates)
+            assignments = ', '.join(f"{field} = ?" for field in ATTORNEY_FIELDS)
+            cursor.executemany(
+                f"UPDATE attorneys SET {assignments}, updated_at = ? WHERE id = ?",
+                [
+                    [record[field] for field in ATTORNEY_FIELDS] + [record['updated_at'], attorney_id]
+                    for attorney_id, record in merged.items()
+                ]
+            )
+            self._link_practice_areas_many(
+                cursor,
+                [(attorney_id, record['practice_areas']) for attorney_id, record in merged.items()]
+            )
+
+            deleted = {attorney_id for (attorney_id,) in duplicates}
+            cursor.executemany(
+                "UPDATE attorneys SET dedup_key = ? WHERE id = ?",
+                [(key, attorney_id) for key, attorney_id in keys if attorney_id not in deleted]
+            )
+
+            cursor.execute("CREATE UNIQUE INDEX idx_dedup_key ON attorneys(dedup_key)")
+            cursor.execute(
+                "INSERT OR REPLACE INTO database_settings (name, value) VALUES ('natural_key', ?)",
+                (','.join(self.natural_key),)
+            )
+
+        if duplicates:
+            print(f"Merged {len(duplicates)} duplicate attorney row(s) on {', '.join(self.natural_key)}")
+
+    def _init_practice_areas(self, conn: sqlite3.Connection):
+        """
+        Create the normalized practice-area tables.
+
+        practice_areas holds one row per canonical area and
+        attorney_practice_areas links attorneys to them. The join table's
+        primary key serves "does this attorney practice X" checks, and the
+        (practice_area_id, attorney_id) index serves "attorneys practicing
+        X, newest first" and facet counts without touching attorneys. On a
+        database created before these tables existed, every attorney's
+        practice_areas text is parsed into links once.
+
+        Args:
+            conn: Connection to create the tables on
+        """
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attorney_practice_areas'"
+        )
+        exists = cursor.fetchone() is not None
+
+        with conn:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS practice_areas (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attorney_practice_areas (
+                    attorney_id INTEGER NOT NULL REFERENCES attorneys(id),
+                    practice_area_id INTEGER NOT NULL REFERENCES practice_areas(id),
+                    PRIMARY KEY (attorney_id, practice_area_id)
+                ) WITHOUT ROWID
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_practice_area_attorney
+                ON attorney_practice_areas(practice_area_id, attorney_id)
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS attorney_practice_areas_delete AFTER DELETE ON attorneys BEGIN
+                    DELETE FROM attorney_practice_areas WHERE attorney_id = old.id;
+                END
+            ''')
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO practice_areas (name) VALUES (?)",
+                [(area,) for area in PRACTICE_AREA_TAXONOMY]
+            )
+
+            if not exists:
+                cursor.execute("SELECT id, practice_areas FROM attorneys WHERE practice_areas IS NOT NULL")
+                self._link_practice_areas_many(cursor, cursor.fetchall())
+
+    def _link_practice_areas(self, cursor: sqlite3.Cursor, attorney_id: int, practice_areas: Optional[str]):
+        """
+        Replace an attorney's practice-area links with those in practice_areas.
+
+        The text is read with the shared taxonomy, so "Family Law, Divorce"
+        links to Family once and "Taxi Accident" does not link to Tax.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            attorney_id: Attorney to link
+            practice_areas: Comma-separated practice areas as stored
+        """
+        self._link_practice_areas_many(cursor, [(attorney_id, practice_areas)])
+
+    def _link_practice_areas_many(self, cursor: sqlite3.Cursor, attorneys: List[Tuple[int, Optional[str]]]):
+        """Replace the practice-area links of many attorneys at once."""
+        cursor.executemany(
+            "DELETE FROM attorney_practice_areas WHERE attorney_id = ?",
+            [(attorney_id,) for attorney_id, _ in attorneys]
+        )
+
+        # Batches repeat the same few practice-area strings
+        parsed: Dict[str, List[str]] = {}
+        links = []
+        for attorney_id, practice_areas in attorneys:
+            if practice_areas:
+                if practice_areas not in parsed:
+                    parsed[practice_areas] = practice_area_matcher.find_all(practice_areas)
+                links.extend((attorney_id, area) for area in parsed[practice_areas])
+        if not links:
+            return
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO practice_areas (name) VALUES (?)",
+            [(area,) for area in {area for _, area in links}]
+        )
+        cursor.executemany('''
+            INSERT OR IGNORE INTO attorney_practice_areas (attorney_id, practice_area_id)
+            SELECT ?, id FROM practice_areas WHERE name = ?
+        ''', links)
+
+    def _init_stats(self, conn: sqlite3.Connection):
+        """
+        Create the statistics tables and the triggers that maintain them.
+
+        attorney_stats holds single counters (total attorneys, distinct
+        cities and states) and attorney_stat_values holds per-value counts
+        for each breakdown dimension. Triggers on attorneys and
+        attorney_practice_areas keep both current inside the writing
+        transaction, so reading statistics never scans the attorneys table.
+        A database created before these tables existed is counted once.
+
+        Args:
+            conn: Connection to create the tables on
+        """
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attorney_stats'"
+        )
+        exists = cursor.fetchone() is not None
+
+        with conn:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attorney_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attorney_stat_values (
+                    dimension TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    attorneys INTEGER NOT NULL,
+                    PRIMARY KEY (dimension, value)
+                ) WITHOUT ROWID
+            ''')
+
+            attorney_dimensions = [
+                (dimension, f'new.{column}', f'old.{column}', counter)
+                for dimension, (column, counter) in STAT_COLUMNS.items()
+            ]
+            attorney_dimensions.append(('day', 'date(new.created_at)', 'date(old.created_at)', None))
+
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS attorney_stats_insert AFTER INSERT ON attorneys BEGIN
+                    UPDATE attorney_stats SET value = value + 1 WHERE name = 'total_attorneys';
+                    {''.join(_stat_add_sql(dimension, new, counter) for dimension, new, _, counter in attorney_dimensions)}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS attorney_stats_delete AFTER DELETE ON attorneys BEGIN
+                    UPDATE attorney_stats SET value = value - 1 WHERE name = 'total_attorneys';
+                    {''.join(_stat_remove_sql(dimension, old, counter) for dimension, _, old, counter in attorney_dimensions)}
+                END
+            ''')
+            for dimension, (column, counter) in STAT_COLUMNS.items():
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS attorney_stats_update_{column}
+                    AFTER UPDATE OF {column} ON attorneys WHEN old.{column} IS NOT new.{column} BEGIN
+                        {_stat_remove_sql(dimension, f'old.{column}', counter)}
+                        {_stat_add_sql(dimension, f'new.{column}', counter)}
+                    END
+                ''')
+
+            practice_area_name = "(SELECT name FROM practice_areas WHERE id = {}.practice_area_id)"
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS attorney_stats_practice_area_insert
+                AFTER INSERT ON attorney_practice_areas BEGIN
+                    {_stat_add_sql('practice_area', practice_area_name.format('new'))}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS attorney_stats_practice_area_delete
+                AFTER DELETE ON attorney_practice_areas BEGIN
+                    {_stat_remove_sql('practice_area', practice_area_name.format('old'))}
+                END
+            ''')
+
+        if not exists:
+            self.rebuild_stats()
+
+    def rebuild_stats(self):
+        """
+        Recount all statistics from the attorney tables.
+
+        Only needed if rows were changed with the statistics triggers
+        disabled; normal writes keep the statistics current.
+        """
+        conn = self.connections.get()
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM attorney_stat_values")
+            for dimension, (column, _) in STAT_COLUMNS.items():
+                cursor.execute(f'''
+                    INSERT INTO attorney_stat_values (dimension, value, attorneys)
+                    SELECT ?, {column}, COUNT(*) FROM attorneys
+                    WHERE {column} IS NOT NULL GROUP BY {column}
+                ''', (dimension,))
+            cursor.execute('''
+                INSERT INTO attorney_stat_values (dimension, value, attorneys)
+                SELECT 'day', date(created_at), COUNT(*) FROM attorneys
+                WHERE date(created_at) IS NOT NULL GROUP BY date(created_at)
+            ''')
+            cursor.execute('''
+                INSERT INTO attorney_stat_values (dimension, value, attorneys)
+                SELECT 'practice_area', p.name, COUNT(*) FROM attorney_practice_areas ap
+                JOIN practice_areas p ON p.id = ap.practice_area_id
+                GROUP BY p.name
+            ''')
+
+            cursor.execute("DELETE FROM attorney_stats")
+            cursor.execute(
+                "INSERT INTO attorney_stats (name, value) SELECT 'total_attorneys', COUNT(*) FROM attorneys"
+            )
+            for dimension, (_, counter) in STAT_COLUMNS.items():
+                cursor.execute('''
+                    INSERT INTO attorney_stats (name, value)
+                    SELECT ?, COUNT(*) FROM attorney_stat_values WHERE dimension = ?
+                ''', (counter, dimension))
+
+    def _init_geo(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the ZIP centroid table and the attorney location index.
+
+        attorney_geo is an R*Tree with one point per attorney, at the
+        centroid of the attorney's ZIP code; triggers place attorneys when
+        they are inserted or their ZIP changes. ZIP codes missing from the
+        centroid table are filled in from the bundled file whenever it
+        changes; centroids loaded with load_zip_centroids take precedence.
+
+        Args:
+            conn: Connection to create the tables on
+
+        Returns:
+            True if radius search is available, False if this SQLite build
+            lacks the R*Tree module
+        """
+        cursor = conn.cursor()
+        try:
+            with conn:
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS zip_centroids (
+                        zip TEXT PRIMARY KEY,
+                        lat REAL NOT NULL,
+                        lon REAL NOT NULL
+                    ) WITHOUT ROWID
+                ''')
+
+                # Bounds are stored as 32-bit floats (rounded outwards);
+                # the exact point is kept in the auxiliary columns
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS attorney_geo USING rtree(
+                        id, min_lat, max_lat, min_lon, max_lon, +lat, +lon
+                    )
+                ''')
+
+                locate = '''
+                    INSERT INTO attorney_geo (id, min_lat, max_lat, min_lon, max_lon, lat, lon)
+                    SELECT new.id, lat, lat, lon, lon, lat, lon FROM zip_centroids
+                    WHERE zip = substr(new.zip_code, 1, 5);
+                '''
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS attorney_geo_insert AFTER INSERT ON attorneys BEGIN
+                        {locate}
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS attorney_geo_delete AFTER DELETE ON attorneys BEGIN
+                        DELETE FROM attorney_geo WHERE id = old.id;
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS attorney_geo_update
+                    AFTER UPDATE OF zip_code ON attorneys WHEN old.zip_code IS NOT new.zip_code BEGIN
+                        DELETE FROM attorney_geo WHERE id = old.id;
+                        {locate}
+                    END
+                ''')
+        except sqlite3.OperationalError as e:
+            print(f"R*Tree unavailable, radius search disabled: {e}")
+            return False
+
+        if os.path.exists(ZIP_CENTROIDS_PATH):
+            with open(ZIP_CENTROIDS_PATH, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            cursor.execute("SELECT value FROM database_settings WHERE name = 'zip_centroids_bundle'")
+            row = cursor.fetchone()
+            if row is None or row[0] != digest:
+                self.load_zip_centroids(ZIP_CENTROIDS_PATH, replace=False)
+                with conn:
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO database_settings (name, value) VALUES ('zip_centroids_bundle', ?)",
+                        (digest,)
+                    )
+
+        return True
+
+    def load_zip_centroids(self, path: str, replace: bool = True) -> int:
+        """
+        Load ZIP centroids and re-place every attorney.
+
+        Args:
+            path: Census Gazetteer ZCTA file or zip,latitude,longitude CSV
+            replace: Whether centroids in the file replace stored ones for
+                the same ZIP; if False only missing ZIPs are added
+
+        Returns:
+            Number of centroids loaded
+        """
+        conn = self.connections.get()
+        with conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO zip_centroids (zip, lat, lon) VALUES (?, ?, ?)",
+                read_zip_centroids(path)
+            )
+            count = cursor.rowcount
+
+            cursor.execute("DELETE FROM attorney_geo")
+            cursor.execute('''
+                INSERT INTO attorney_geo (id, min_lat, max_lat, min_lon, max_lon, lat, lon)
+                SELECT a.id, z.lat, z.lat, z.lon, z.lon, z.lat, z.lon
+                FROM attorneys a JOIN zip_centroids z ON z.zip = substr(a.zip_code, 1, 5)
+            ''')
+
+        return count
+
+    def _init_write_generation(self, conn: sqlite3.Connection):
+        """
+        Create the write generation counter and the triggers that bump it.
+
+        Every change to the tables searches read (attorneys, their practice
+        areas and the ZIP centroids that place them) increments the
+        counter, so cached search pages from before the change are never
+        served again.
+
+        Args:
+            conn: Connection to create the table on
+        """
+        tables = ['attorneys', 'attorney_practice_areas']
+        if self.geo_enabled:
+            tables.append('zip_centroids')
+
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS write_generation (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    value INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute("INSERT OR IGNORE INTO write_generation (id, value) VALUES (1, 0)")
+
+            for table in tables:
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_write_generation_{event.lower()}
+                        AFTER {event} ON {table} BEGIN
+                            UPDATE write_generation SET value = value + 1 WHERE id = 1;
+                        END
+                    ''')
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the FTS5 index over attorneys and the triggers that sync it.
+
+        The index is an external-content table: it stores only the inverted
+        index and reads column values from attorneys, so text is not stored
+        twice. An index created on an existing database is filled once.
+
+        Args:
+            conn: Connection to create the index on
+
+        Returns:
+            True if FTS5 is available and the index is ready, False if
+            searches must fall back to LIKE scans
+        """
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attorneys_fts'"
+        )
+        exists = cursor.fetchone() is not None
+
+        columns = ', '.join(FTS_COLUMNS)
+        new_columns = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+        old_columns = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+
+        try:
+            with conn:
+                # Prefix indexes make 2- and 3-character prefix queries
+                # ("sa*", "fam*") index lookups instead of term scans
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS attorneys_fts USING fts5(
+                        {columns},
+                        content='attorneys',
+                        content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2',
+                        prefix='2 3'
+                    )
+                ''')
+
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS attorneys_fts_insert AFTER INSERT ON attorneys BEGIN
+                        INSERT INTO attorneys_fts(rowid, {columns}) VALUES (new.id, {new_columns});
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS attorneys_fts_delete AFTER DELETE ON attorneys BEGIN
+                        INSERT INTO attorneys_fts(attorneys_fts, rowid, {columns})
+                        VALUES ('delete', old.id, {old_columns});
+                    END
+                ''')
+                # Only changes to indexed columns touch the index (re-keying
+                # rows for deduplication does not)
+                cursor.execute("DROP TRIGGER IF EXISTS attorneys_fts_update")
+                cursor.execute(f'''
+                    CREATE TRIGGER attorneys_fts_update AFTER UPDATE OF {columns} ON attorneys BEGIN
+                        INSERT INTO attorneys_fts(attorneys_fts, rowid, {columns})
+                        VALUES ('delete', old.id, {old_columns});
+                        INSERT INTO attorneys_fts(rowid, {columns}) VALUES (new.id, {new_columns});
+                    END
+                ''')
+
+                if not exists:
+                    cursor.execute("INSERT INTO attorneys_fts(attorneys_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, using LIKE search: {str(e)}")
+            return False
+
+        return True
 
     def add_attorney(self, attorney_data: Dict) -> int:
         """
-        Add a new attorney to the database.
+        Add an attorney, or update the existing record with the same natural key.
 
         Args:
             attorney_data: Dictionary containing attorney information
 
         Returns:
-            ID of the inserted attorney
+            ID of the inserted or updated attorney
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        row = self._attorney_row(attorney_data, datetime.now())
+        if row is None:
+            raise ValueError("attorney_data must include a name")
 
-        cursor.execute('''
-            INSERT INTO attorneys (
-                name, phone, email, website, address, city, state,
-                zip_code, practice_areas, source_url, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            attorney_data.get('name'),
-            attorney_data.get('phone'),
-            attorney_data.get('email'),
-            attorney_data.get('website'),
-            attorney_data.get('address'),
-            attorney_data.get('city'),
-            attorney_data.get('state'),
-            attorney_data.get('zip_code'),
-            attorney_data.get('practice_areas'),
-            attorney_data.get('source_url'),
-            datetime.now()
-        ))
-
-        attorney_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        conn = self.connections.get()
+        # The connection outlives this call, so a failed insert must not
+        # leave its transaction open: commit on success, roll back on error
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(self._upsert_sql() + " RETURNING id, practice_areas", row)
+            changed = cursor.fetchall()
+
+            if changed:
+                attorney_id, practice_areas = changed[0]
+                self._link_practice_areas(cursor, attorney_id, practice_areas)
+            else:
+                # Same key and nothing new: the existing row is untouched
+                cursor.execute("SELECT id FROM attorneys WHERE dedup_key = ?", (row[-2],))
+                attorney_id = cursor.fetchone()[0]
 
         return attorney_id
 
+    def add_attorneys_many(self, attorneys: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Add or update a batch of attorneys in one transaction.
+
+        Records are upserted on the natural key with executemany. A record
+        matching an existing attorney fills in and replaces its fields,
+        and updated_at only changes when some field actually does.
+        Records without a name are skipped.
+
+        Args:
+            attorneys: Attorney data dictionaries
+
+        Returns:
+            Counts of records 'inserted', 'updated', 'unchanged' and 'skipped'
+        """
+        now = datetime.now()
+        rows = []
+        skipped = 0
+        for attorney_data in attorneys:
+            row = self._attorney_row(attorney_data, now)
+            if row is None:
+                skipped += 1
+            else:
+                rows.append(row)
+
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+        if not rows:
+            return counts
+
+        conn = self.connections.get()
+        with conn:
+            cursor = conn.cursor()
+            # Take the write lock first so the id watermark below is ours
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM attorneys")
+            max_id = cursor.fetchone()[0]
+
+            cursor.executemany(self._upsert_sql(), rows)
+
+            # New rows get ids above the watermark; existing rows this batch
+            # changed carry its timestamp
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS batch_keys (dedup_key TEXT PRIMARY KEY)")
+            cursor.execute("DELETE FROM batch_keys")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO batch_keys (dedup_key) VALUES (?)",
+                [(row[-2],) for row in rows if row[-2] is not None]
+            )
+            cursor.execute('''
+                SELECT id, practice_areas FROM attorneys WHERE id > ?
+                UNION ALL
+                SELECT a.id, a.practice_areas FROM batch_keys k
+                JOIN attorneys a ON a.dedup_key = k.dedup_key
+                WHERE a.id <= ? AND a.updated_at = ?
+            ''', (max_id, max_id, now))
+            changed = cursor.fetchall()
+            self._link_practice_areas_many(cursor, changed)
+
+        counts['inserted'] = sum(1 for attorney_id, _ in changed if attorney_id > max_id)
+        counts['updated'] = len(changed) - counts['inserted']
+        counts['unchanged'] = max(len(rows) - len(changed), 0)
+        return counts
+
+    def _attorney_row(self, attorney_data: Dict, updated_at: datetime) -> Optional[List]:
+        """
+        Column values for an upsert: ATTORNEY_FIELDS, dedup_key, updated_at.
+
+        Blank strings are stored as NULL so they never overwrite data.
+
+        Returns:
+            Row values, or None if the record has no name
+        """
+        values = []
+        for field in ATTORNEY_FIELDS:
+            value = attorney_data.get(field)
+            if isinstance(value, str):
+                value = value.strip() or None
+            values.append(value)
+
+        if not values[0]:
+            return None
+        return values + [_dedup_key(attorney_data, self.natural_key), updated_at]
+
+    def _upsert_sql(self) -> str:
+        """INSERT that updates the row with the same dedup_key if any field changes."""
+        columns = ATTORNEY_FIELDS + ['dedup_key', 'updated_at']
+        placeholders = ', '.join('?' for _ in columns)
+        merged = {field: f"COALESCE(excluded.{field}, attorneys.{field})" for field in ATTORNEY_FIELDS}
+        assignments = ', '.join(f"{field} = {value}" for field, value in merged.items())
+        changed = ' OR '.join(f"{value} IS NOT attorneys.{field}" for field, value in merged.items())
+        return (
+            f"INSERT INTO attorneys ({', '.join(columns)}) VALUES ({placeholders})"
+            f" ON CONFLICT(dedup_key) DO UPDATE SET {assignments}, updated_at = excluded.updated_at"
+            f" WHERE {changed}"
+        )
+
     def search_attorneys(
         self,
         city: Optional[str] = None,
         zip_code: Optional[str] = None,
         practice_area: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        radius_miles: Optional[float] = None
     ) -> List[Dict]:
         """
-        Search for attorneys by location and practice area.
+        Search for attorneys by location, practice area and free text.
+
+        See search_attorneys_page for matching, ordering and cursors.
 
         Args:
             city: City name
-            zip_code: ZIP code
+            zip_code: ZIP code or ZIP prefix
             practice_area: Practice area keyword
             limit: Maximum number of results
+            query: Free text matched against name, city, practice areas
+                and address
+            cursor: Cursor from search_attorneys_page to continue after
+            radius_miles: Search within this distance of zip_code
 
         Returns:
             List of attorney dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        return self.search_attorneys_page(
+            city=city,
+            zip_code=zip_code,
+            practice_area=practice_area,
+            query=query,
+            page_size=limit,
+            cursor=cursor,
+            radius_miles=radius_miles
+        )['results']
 
-        query = "SELECT * FROM attorneys WHERE 1=1"
-        params = []
+    def search_attorneys_page(
+        self,
+        city: Optional[str] = None,
+        zip_code: Optional[str] = None,
+        practice_area: Optional[str] = None,
+        query: Optional[str] = None,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        radius_miles: Optional[float] = None
+    ) -> Dict:
+        """
+        Fetch one page of search results and a cursor for the next page.
 
-        if city:
-            query += " AND LOWER(city) LIKE ?"
-            params.append(f"%{city.lower()}%")
+        Practice areas known to the taxonomy (including synonyms such as
+        "divorce") are matched exactly through the practice-area join
+        table. City, other practice-area and free-text terms are matched
+        as word prefixes through the full-text index ("san fran" finds San
+        Francisco). ZIP codes match by prefix ("941" finds 94103), or with
+        radius_miles, every attorney within that distance of the ZIP code's
+        centroid matches (ZIP codes without a known centroid fall back to
+        prefix matching).
+
+        Radius searches return the nearest attorneys first, each with its
+        'distance_miles'. Results of a free-text query are ranked by BM25
+        relevance; other searches return the most recently added attorneys
+        first, which is descending id order. Pagination is keyset-based:
+        the cursor holds the sort key of the last row returned and the next
+        page starts right after it, so every unranked page is an index seek
+        (the primary key, idx_practice_area_attorney, idx_zip5_id or the
+        full-text index's rowid order) no matter how deep it is. The
+        exception is a ZIP prefix shorter than five digits, whose matches
+        are sorted on every page. Rows added between pages never shift or
+        repeat results.
+
+        Pages are kept in search_cache and served from it until the next
+        write to the database.
 
-        if zip_code:
-            query += " AND zip_code LIKE ?"
-            params.append(f"%{zip_code}%")
+        Args:
+            city: City name
+            zip_code: ZIP code or ZIP prefix
+            practice_area: Practice area keyword
+            query: Free text matched against name, city, practice areas
+                and address
+            page_size: Maximum number of results on the page
+            cursor: next_cursor of the previous page, or None for the first
+            radius_miles: Search within this distance of zip_code
+
+        Returns:
+            Dictionary with 'results' (list of attorney dictionaries) and
+            'next_cursor' (opaque string, or None on the last page)
 
+        Raises:
+            ValueError: If the cursor is malformed or belongs to a
+                different kind of search, or radius_miles is not a positive number
+        """
+        key = _search_key(city, zip_code, practice_area, query, page_size, cursor, radius_miles)
+        # Read before searching: a write committed meanwhile moves the
+        # generation on and the page is never served
+        generation = self.write_generation()
+
+        page = self.search_cache.get(key, generation)
+        if page is None:
+            page = self._search_page(city, zip_code, practice_area, query, page_size, cursor, radius_miles)
+            self.search_cache.put(key, generation, page)
+
+        # Callers may modify the results; the cached page must not change
+        return {'results': [dict(row) for row in page['results']], 'next_cursor': page['next_cursor']}
+
+    def write_generation(self) -> int:
+        """
+        Counter that changes whenever searchable data is written.
+
+        Triggers bump it inside every writing transaction, whichever
+        connection or process writes, so every connection reads the same
+        value for the same data.
+
+        Returns:
+            Current write generation
+        """
+        cursor = self.connections.get().execute("SELECT value FROM write_generation WHERE id = 1")
+        return cursor.fetchone()[0]
+
+    def _search_page(
+        self,
+        city: Optional[str],
+        zip_code: Optional[str],
+        practice_area: Optional[str],
+        query: Optional[str],
+        page_size: int,
+        cursor: Optional[str],
+        radius_miles: Optional[float]
+    ) -> Dict:
+        """Run a search_attorneys_page search against the database."""
+        if radius_miles is not None and not (math.isfinite(radius_miles) and radius_miles > 0):
+            raise ValueError("radius_miles must be a positive number")
+
+        db_cursor = self.connections.get().cursor()
+        db_cursor.row_factory = sqlite3.Row
+
+        center = None
+        if radius_miles is not None and self.geo_enabled:
+            center = self._zip_centroid(db_cursor, zip_code)
+
+        ranked = bool(query and FTS_TOKEN_PATTERN.search(query)) and self.fts_enabled and not center
+        after = _decode_cursor(cursor, 2 if ranked or center else 1) if cursor else None
+
+        practice_area_id = None
         if practice_area:
-            query += " AND LOWER(practice_areas) LIKE ?"
-            params.append(f"%{practice_area.lower()}%")
+            practice_area_id = self._practice_area_id(db_cursor, practice_area)
+            if practice_area_id is not None:
+                practice_area = None
 
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
+        if center:
+            sql, params = self._radius_search_sql(
+                center, radius_miles, city, practice_area, practice_area_id, query, after
+            )
+        elif self.fts_enabled:
+            sql, params = self._fts_search_sql(city, zip_code, practice_area, practice_area_id, query, after)
+        else:
+            sql, params = self._like_search_sql(city, zip_code, practice_area, practice_area_id, query, after)
+
+        # One extra row tells whether there is a next page
+        sql += " LIMIT ?"
+        params.append(page_size + 1)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        db_cursor.execute(sql, params)
+        rows = [dict(row) for row in db_cursor.fetchall()]
 
-        attorneys = [dict(row) for row in rows]
-        conn.close()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            if center:
+                next_cursor = _encode_cursor([last['distance_miles'], last['id']])
+            elif ranked:
+                next_cursor = _encode_cursor([last['search_score'], last['id']])
+            else:
+                next_cursor = _encode_cursor([last['id']])
 
-        return attorneys
+        for row in rows:
+            row.pop('search_score', None)
+            if 'distance_miles' in row:
+                row['distance_miles'] = round(row['distance_miles'], 2)
+
+        return {'results': rows, 'next_cursor': next_cursor}
+
+    def _practice_area_id(self, cursor: sqlite3.Cursor, practice_area: str) -> Optional[int]:
+        """Id of the canonical practice area a search term refers to, if any."""
+        area = practice_area_matcher.canonicalize(practice_area)
+        if area is None:
+            return None
+        cursor.execute("SELECT id FROM practice_areas WHERE name = ?", (area,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _fts_search_sql(
+        self,
+        city: Optional[str],
+        zip_code: Optional[str],
+        practice_area: Optional[str],
+        practice_area_id: Optional[int],
+        query: Optional[str],
+        after: Optional[List] = None
+    ) -> Tuple[str, List]:
+        """Build an FTS5 search: column-filtered prefix phrases plus free-text terms."""
+        match_terms = []
+        if city:
+            match_terms.append(_fts_phrase(city, column='city'))
+        if practice_area:
+            match_terms.append(_fts_phrase(practice_area, column='practice_areas'))
+        query_terms = [_fts_phrase(token) for token in FTS_TOKEN_PATTERN.findall(query or '')]
+        match_terms.extend(query_terms)
+        match_terms = [term for term in match_terms if term]
+
+        zip_prefix = _zip_prefix(zip_code)
+        if zip_prefix and match_terms:
+            # Combined with other terms, the ZIP is one more posting list
+            # for FTS5 to intersect rather than a per-row check
+            match_terms.append(_fts_phrase(zip_prefix, column='zip_code'))
+
+        params = []
+        if query_terms:
+            weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+            sql = (
+                f"SELECT a.*, bm25(attorneys_fts, {weights}) AS search_score FROM attorneys_fts"
+                " JOIN attorneys a ON a.id = attorneys_fts.rowid"
+                " WHERE attorneys_fts MATCH ?"
+            )
+            params.append(' AND '.join(match_terms))
+            order = "search_score, a.id DESC"
+            if after:
+                sql += " AND (search_score > ? OR (search_score = ? AND a.id < ?))"
+                params.extend([after[0], after[0], after[1]])
+        elif match_terms:
+            # Ids increase with insertion time, and FTS5 returns rowids in
+            # descending order (starting below the cursor) without sorting
+            sql = (
+                "SELECT a.* FROM attorneys_fts"
+                " JOIN attorneys a ON a.id = attorneys_fts.rowid"
+                " WHERE attorneys_fts MATCH ?"
+            )
+            params.append(' AND '.join(match_terms))
+            order = "attorneys_fts.rowid DESC"
+            if after:
+                sql += " AND attorneys_fts.rowid < ?"
+                params.append(after[0])
+        elif practice_area_id is not None:
+            # Walk idx_practice_area_attorney newest first
+            sql = (
+                "SELECT a.* FROM attorney_practice_areas ap"
+                " JOIN attorneys a ON a.id = ap.attorney_id"
+                " WHERE ap.practice_area_id = ?"
+            )
+            params.append(practice_area_id)
+            order = "ap.attorney_id DESC"
+            if after:
+                sql += " AND ap.attorney_id < ?"
+                params.append(after[0])
+        else:
+            sql = "SELECT a.* FROM attorneys a WHERE 1=1"
+            order = "a.id DESC"
+            if after:
+                sql += " AND a.id < ?"
+                params.append(after[0])
+
+        if match_terms and practice_area_id is not None:
+            sql += " AND" + PRACTICE_AREA_FILTER
+            params.append(practice_area_id)
+
+        if zip_prefix and not match_terms:
+            zip_sql, zip_params = _zip_filter(zip_prefix)
+            sql += zip_sql
+            params.extend(zip_params)
+
+        return sql + f" ORDER BY {order}", params
+
+    def _zip_centroid(self, cursor: sqlite3.Cursor, zip_code: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Centroid of a 5-digit ZIP code, if known."""
+        zip_prefix = _zip_prefix(zip_code)
+        if not zip_prefix or len(zip_prefix) < 5:
+            return None
+        cursor.execute("SELECT lat, lon FROM zip_centroids WHERE zip = ?", (zip_prefix[:5],))
+        row = cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _radius_search_sql(
+        self,
+        center: Tuple[float, float],
+        radius_miles: float,
+        city: Optional[str],
+        practice_area: Optional[str],
+        practice_area_id: Optional[int],
+        query: Optional[str],
+        after: Optional[List] = None
+    ) -> Tuple[str, List]:
+        """Build a radius search: an attorney_geo box probe refined by exact distance."""
+        lat, lon = center
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_miles)
+
+        # Materialized so each candidate's distance is computed only once
+        sql = (
+            "WITH nearby AS MATERIALIZED ("
+            " SELECT g.id, haversine_miles(?, ?, g.lat, g.lon) AS distance_miles FROM attorney_geo g"
+            " WHERE g.max_lat >= ? AND g.min_lat <= ? AND g.max_lon >= ? AND g.min_lon <= ?"
+            ") SELECT a.*, n.distance_miles FROM nearby n"
+            " JOIN attorneys a ON a.id = n.id"
+            " WHERE n.distance_miles <= ?"
+        )
+        params = [lat, lon, min_lat, max_lat, min_lon, max_lon, radius_miles]
+
+        if after:
+            sql += " AND (n.distance_miles > ? OR (n.distance_miles = ? AND n.id < ?))"
+            params.extend([after[0], after[0], after[1]])
+
+        if practice_area_id is not None:
+            sql += " AND" + PRACTICE_AREA_FILTER
+            params.append(practice_area_id)
+
+        # The box holds few rows, so checking text on each is cheaper than
+        # collecting every full-text match
+        filter_sql, filter_params = _like_filters(city, practice_area, query)
+        sql += filter_sql
+        params.extend(filter_params)
+
+        return sql + " ORDER BY n.distance_miles, n.id DESC", params
+
+    def _like_search_sql(
+        self,
+        city: Optional[str],
+        zip_code: Optional[str],
+        practice_area: Optional[str],
+        practice_area_id: Optional[int],
+        query: Optional[str],
+        after: Optional[List] = None
+    ) -> Tuple[str, List]:
+        """Build a LIKE scan search for SQLite builds without FTS5."""
+        sql = "SELECT * FROM attorneys a WHERE 1=1"
+        params = []
+
+        if after:
+            sql += " AND id < ?"
+            params.append(after[0])
+
+        if practice_area_id is not None:
+            sql += " AND" + PRACTICE_AREA_FILTER
+            params.append(practice_area_id)
+
+        zip_prefix = _zip_prefix(zip_code)
+        if zip_prefix:
+            zip_sql, zip_params = _zip_filter(zip_prefix)
+            sql += zip_sql
+            params.extend(zip_params)
+
+        filter_sql, filter_params = _like_filters(city, practice_area, query)
+        sql += filter_sql
+        params.extend(filter_params)
+
+        sql += " ORDER BY id DESC"
+        return sql, params
 
     def get_attorney_by_id(self, attorney_id: int) -> Optional[Dict]:
         """Get attorney by ID."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = self.connections.get().cursor()
+        cursor.row_factory = sqlite3.Row
 
         cursor.execute("SELECT * FROM attorneys WHERE id = ?", (attorney_id,))
         row = cursor.fetchone()
 
-        conn.close()
-
         return dict(row) if row else None
 
-    def get_stats(self) -> Dict:
-        """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_attorneys_by_ids(self, attorney_ids: List[int]) -> List[Dict]:
+        """
+        Get several attorneys by ID in one query.
+
+        Args:
+            attorney_ids: Attorney IDs
 
-        cursor.execute("SELECT COUNT(*) FROM attorneys")
-        total = cursor.fetchone()[0]
+        Returns:
+            Attorney dictionaries in the order of attorney_ids; IDs that no
+            longer exist are left out
+        """
+        if not attorney_ids:
+            return []
+
+        cursor = self.connections.get().cursor()
+        cursor.row_factory = sqlite3.Row
+
+        placeholders = ', '.join('?' * len(attorney_ids))
+        cursor.execute(f"SELECT * FROM attorneys WHERE id IN ({placeholders})", list(attorney_ids))
+        rows = {row['id']: dict(row) for row in cursor.fetchall()}
+
+        return [rows[attorney_id] for attorney_id in attorney_ids if attorney_id in rows]
+
+    def get_practice_area_counts(self) -> Dict[str, int]:
+        """
+        Number of attorneys per practice area, for search facets.
+
+        Returns:
+            Dictionary of practice area -> attorney count, largest first
+        """
+        return self._stat_breakdown('practice_area')
 
-        cursor.execute("SELECT COUNT(DISTINCT city) FROM attorneys WHERE city IS NOT NULL")
-        cities = cursor.fetchone()[0]
+    def get_state_counts(self) -> Dict[str, int]:
+        """
+        Number of attorneys per state.
+
+        Returns:
+            Dictionary of state -> attorney count, largest first
+        """
+        return self._stat_breakdown('state')
+
+    def get_daily_additions(self, days: int = 30) -> Dict[str, int]:
+        """
+        Number of attorneys added per day.
 
-        cursor.execute("SELECT COUNT(DISTINCT state) FROM attorneys WHERE state IS NOT NULL")
-        states = cursor.fetchone()[0]
+        Args:
+            days: Number of most recent days with additions to return
 
-        conn.close()
+        Returns:
+            Dictionary of date (YYYY-MM-DD) -> attorneys added, newest first
+        """
+        cursor = self.connections.get().cursor()
+        cursor.execute('''
+            SELECT value, attorneys FROM attorney_stat_values
+            WHERE dimension = 'day'
+            ORDER BY value DESC LIMIT ?
+        ''', (days,))
+        return {day: count for day, count in cursor.fetchall()}
+
+    def _stat_breakdown(self, dimension: str) -> Dict[str, int]:
+        """Per-value attorney counts of one statistics dimension, largest first."""
+        cursor = self.connections.get().cursor()
+        cursor.execute('''
+            SELECT value, attorneys FROM attorney_stat_values
+            WHERE dimension = ?
+            ORDER BY attorneys DESC, value
+        ''', (dimension,))
+        return {value: count for value, count in cursor.fetchall()}
+
+    def get_stats(self) -> Dict:
+        """Get database statistics (maintained by triggers, read in constant time)."""
+        cursor = self.connections.get().cursor()
+        cursor.execute("SELECT name, value FROM attorney_stats")
+        counters = dict(cursor.fetchall())
 
         return {
-            'total_attorneys': total,
-            'unique_cities': cities,
-            'unique_states': states
+            'total_attorneys': counters.get('total_attorneys', 0),
+            'unique_cities': counters.get('unique_cities', 0),
+            'unique_states': counters.get('unique_states', 0)
         }
+
+
+def _fts_phrase(text: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Turn user text into an FTS5 prefix phrase, optionally limited to a column.
+
+    Only word characters are kept, so quotes and FTS5 operators in user
+    input can never change the query's meaning.
+
+    Args:
+        text: User search text
+        column: Column to restrict the phrase to
+
+    Returns:
+        FTS5 expression such as ``city : "san fran" *``, or None if the
+        text has no searchable words
+    """
+    tokens = FTS_TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    phrase = '"' + ' '.join(tokens) + '" *'
+    return f"{column} : {phrase}" if column else phrase
+
+
+def _zip_prefix(zip_code: Optional[str]) -> Optional[str]:
+    """Digits of a ZIP code search, or None if there are none."""
+    if not zip_code:
+        return None
+    digits = re.sub(r'\D', '', zip_code)
+    return digits or None
+
+
+def _zip_filter(zip_prefix: str) -> Tuple[str, List]:
+    """
+    WHERE clause matching ZIP codes that start with zip_prefix.
+
+    A prefix of five digits or more is an equality on idx_zip5_id, which
+    also yields rows in id order for the keyset cursor; a shorter prefix
+    is a GLOB range scan on idx_zip, and its matches are sorted.
+
+    Args:
+        zip_prefix: Digits of the ZIP code search
+
+    Returns:
+        Tuple of (SQL starting with " AND", parameters)
+    """
+    if len(zip_prefix) < 5:
+        return " AND a.zip_code GLOB ?", [zip_prefix + '*']
+
+    sql = " AND substr(a.zip_code, 1, 5) = ?"
+    params = [zip_prefix[:5]]
+    if len(zip_prefix) > 5:
+        sql += " AND a.zip_code GLOB ?"
+        params.append(zip_prefix + '*')
+    return sql, params
+
+
+def _search_key(
+    city: Optional[str],
+    zip_code: Optional[str],
+    practice_area: Optional[str],
+    query: Optional[str],
+    page_size: int,
+    cursor: Optional[str],
+    radius_miles: Optional[float]
+) -> Tuple:
+    """
+    Cache key of a search; searches differing only in case or spacing share one.
+
+    Args:
+        city: City name
+        zip_code: ZIP code or ZIP prefix
+        practice_area: Practice area keyword
+        query: Free text
+        page_size: Maximum number of results on the page
+        cursor: Cursor of the page
+        radius_miles: Search radius
+
+    Returns:
+        Hashable key
+    """
+    def normalize(text: Optional[str]) -> str:
+        return ' '.join((text or '').lower().split())
+
+    return (
+        normalize(city),
+        _zip_prefix(zip_code) or '',
+        normalize(practice_area),
+        normalize(query),
+        page_size,
+        cursor,
+        float(radius_miles) if radius_miles is not None else None
+    )
+
+
+def _like_filters(
+    city: Optional[str],
+    practice_area: Optional[str],
+    query: Optional[str]
+) -> Tuple[str, List]:
+    """
+    LIKE conditions for the text parts of a search, for builds without FTS5.
+
+    Args:
+        city: City name
+        practice_area: Practice area matched as text
+        query: Free text
+
+    Returns:
+        Tuple of (SQL to append to a WHERE clause, its parameters)
+    """
+    sql = ""
+    params = []
+
+    if city:
+        sql += " AND LOWER(city) LIKE ?"
+        params.append(f"%{city.lower()}%")
+
+    if practice_area:
+        sql += " AND LOWER(practice_areas) LIKE ?"
+        params.append(f"%{practice_area.lower()}%")
+
+    if query:
+        searchable = " || ' ' || ".join(f"COALESCE({column}, '')" for column in FTS_COLUMNS)
+        for token in FTS_TOKEN_PATTERN.findall(query.lower()):
+            sql += f" AND LOWER({searchable}) LIKE ?"
+            params.append(f"%{token}%")
+
+    return sql, params
+
+
+def _stat_add_sql(dimension: str, value: str, counter: Optional[str] = None) -> str:
+    """
+    Trigger statements counting one more attorney for a statistics value.
+
+    Args:
+        dimension: Statistics dimension
+        value: SQL expression for the value (NULL is not counted)
+        counter: attorney_stats counter of distinct values to bump when
+            this value is seen for the first time
+
+    Returns:
+        SQL statements for a trigger body
+    """
+    sql = ''
+    if counter:
+        sql += f'''
+            UPDATE attorney_stats SET value = value + 1
+            WHERE name = '{counter}' AND {value} IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM attorney_stat_values WHERE dimension = '{dimension}' AND value = {value}
+            );'''
+    sql += f'''
+        INSERT INTO attorney_stat_values (dimension, value, attorneys)
+        SELECT '{dimension}', {value}, 1 WHERE {value} IS NOT NULL
+        ON CONFLICT (dimension, value) DO UPDATE SET attorneys = attorneys + 1;'''
+    return sql
+
+
+def _stat_remove_sql(dimension: str, value: str, counter: Optional[str] = None) -> str:
+    """
+    Trigger statements counting one less attorney for a statistics value.
+
+    Values whose count reaches zero are removed (and no longer counted
+    as distinct).
+
+    Args:
+        dimension: Statistics dimension
+        value: SQL expression for the value
+        counter: attorney_stats counter of distinct values
+
+    Returns:
+        SQL statements for a trigger body
+    """
+    sql = f'''
+        UPDATE attorney_stat_values SET attorneys = attorneys - 1
+        WHERE dimension = '{dimension}' AND value = {value};'''
+    if counter:
+        sql += f'''
+            UPDATE attorney_stats SET value = value - 1
+            WHERE name = '{counter}' AND EXISTS (
+                SELECT 1 FROM attorney_stat_values
+                WHERE dimension = '{dimension}' AND value = {value} AND attorneys <= 0
+            );'''
+    sql += f'''
+        DELETE FROM attorney_stat_values
+        WHERE dimension = '{dimension}' AND value = {value} AND attorneys <= 0;'''
+    return sql
+
+
+def _dedup_key(attorney_data: Dict, natural_key: List[str]) -> Optional[str]:
+    """
+    Normalized natural key of a record.
+
+    URLs lose their fragment and trailing slash and have their scheme and
+    host lowercased, emails and names are lowercased with whitespace
+    collapsed, and phones reduce to the last ten digits of the first number.
+
+    Args:
+        attorney_data: Attorney data dictionary
+        natural_key: Fields making up the key
+
+    Returns:
+        Key string, or None if any key field is missing (such records are
+        never merged)
+    """
+    parts = []
+    for field in natural_key:
+        value = attorney_data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+
+        if field in ('source_url', 'website'):
+            part = _url_key(value)
+        elif field == 'phone':
+            part = re.sub(r'\D', '', value.split(',')[0])[-10:]
+        else:
+            part = ' '.join(value.lower().split())
+
+        if not part:
+            return None
+        parts.append(part)
+
+    return '\x1f'.join(parts)
+
+
+def _url_key(url: str) -> str:
+    """Cheap URL normalization for natural keys (runs once per ingested record)."""
+    url = url.strip().split('#', 1)[0]
+    scheme_end = url.find('://')
+    if scheme_end != -1:
+        host_end = url.find('/', scheme_end + 3)
+        if host_end == -1:
+            host_end = len(url)
+        url = url[:host_end].lower() + url[host_end:]
+    return url.rstrip('/')
+
+
+def _encode_cursor(values: List) -> str:
+    """Pack a row's sort key into an opaque, URL-safe cursor string."""
+    packed = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(packed).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, size: int) -> List:
+    """
+    Unpack a cursor made by _encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        size: Number of sort-key values the current search expects
+
+    Returns:
+        Sort-key values
+
+    Raises:
+        ValueError: If the cursor is malformed or has the wrong shape
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid search cursor")
+
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)):
+        raise ValueError("Invalid search cursor")
+    return values
@@ -0,0 +1,106 @@
+"""
+Persistent, per-thread SQLite connections for the attorney database.
+
+Opening a connection, reading the schema and re-preparing statements is a
+large share of a small query's latency. Connections are instead opened once
+per thread and kept: sqlite3 connections must not be shared between threads
+that use them concurrently, and one connection per thread lets web search,
+stats and bot handlers read while the scraper writes.
+
+The database runs in WAL mode, where readers never block the writer and the
+writer never blocks readers. synchronous=NORMAL is durable across
+application crashes in WAL mode and only risks the last transactions on
+power loss, in exchange for not syncing on every commit.
+"""
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Connection tuning
+BUSY_TIMEOUT_SECONDS = 10.0
+CACHE_SIZE_KB = 16 * 1024
+MMAP_SIZE_BYTES = 128 * 1024 * 1024
+CACHED_STATEMENTS = 256
+
+
+class ConnectionManager:
+    """Hands out one persistent, tuned SQLite connection per thread."""
+
+    def __init__(
+        self,
+        db_path: str,
+        cache_size_kb: int = CACHE_SIZE_KB,
+        mmap_size: int = MMAP_SIZE_BYTES,
+        cached_statements: int = CACHED_STATEMENTS,
+        functions: Optional[Dict[str, Tuple[int, Callable]]] = None
+    ):
+        """
+        Initialize manager; connections are opened on first use.
+
+        Args:
+            db_path: Path to SQLite database file
+            cache_size_kb: Page cache per connection, in KiB
+            mmap_size: Bytes of the database file to memory-map for reads
+            cached_statements: Prepared statements kept per connection
+            functions: SQL functions to register on every connection, as
+                name -> (number of arguments, deterministic callable)
+        """
+        self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.functions = functions or {}
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+
+    def get(self) -> sqlite3.Connection:
+        """
+        Connection for the calling thread, opened and tuned on first use.
+
+        Returns:
+            SQLite connection owned by the current thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._prune()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def close_all(self):
+        """Close every connection; threads reopen one on their next call."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection and apply the performance pragmas."""
+        # Each connection is only used by the thread that opened it;
+        # check_same_thread is off so close_all can close it from elsewhere
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        for name, (num_args, func) in self.functions.items():
+            conn.create_function(name, num_args, func, deterministic=True)
+        return conn
+
+    def _prune(self):
+        """Close connections left behind by threads that have exited."""
+        for thread in [thread for thread in self._connections if not thread.is_alive()]:
+            self._connections.pop(thread).close()
@@ -0,0 +1,178 @@
+"""
+Single-pass page index shared by the attorney field extractors.
+
+Instead of every extractor running its own CSS-selector cascade and
+rebuilding the page text, the document is walked once and every element an
+extractor might need is recorded in document order. Extractors then read
+from the index.
+"""
+import re
+from typing import List, Dict, Optional
+from bs4 import BeautifulSoup, Tag
+
+from structured_data import is_attorney_microdata
+
+
+# Patterns used by the extractors, compiled once per process
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_VALID_PATTERN = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$')
+MAILTO_PATTERN = re.compile(r'^mailto:')
+POSTAL_ADDRESS_PATTERN = re.compile(r'PostalAddress')
+ZIP_PATTERN = re.compile(r'\b\d{5}(?:-\d{4})?\b')
+STATE_PATTERN = re.compile(r'\b([A-Z]{2})\b')
+
+# Link discovery for directory crawls: individual profile pages, listing
+# pages that enumerate profiles, and pagination within listings
+PROFILE_PATH_PATTERN = re.compile(
+    r'/(?:attorneys?|lawyers?|people|professionals?|profiles?|our-team|team|bios?)/[^/?#]+/?$',
+    re.IGNORECASE
+)
+LISTING_PATH_PATTERN = re.compile(
+    r'/(?:attorneys?|lawyers?|people|professionals?|our-team|team|directory)/?$',
+    re.IGNORECASE
+)
+PAGINATION_PATTERN = re.compile(r'[?&](?:page|pg|p|start|offset|letter)=[^&#]+|/page/\d+/?$', re.IGNORECASE)
+NEXT_LINK_TEXT_PATTERN = re.compile(r'^(?:next|more|older|next page|[›»>]+)$', re.IGNORECASE)
+
+# Name selectors in priority order
+NAME_SELECTORS = [
+    'h1.attorney-name',
+    'h1.profile-name',
+    '.attorney-info h1',
+    'h1',
+    '.profile-header h1',
+    '[itemprop="name"]',
+    '.lawyer-name'
+]
+
+# Address selectors in priority order
+ADDRESS_SELECTORS = [
+    '.address',
+    '.location',
+    '.contact-info',
+    '[itemprop="address"]'
+]
+
+
+class PageIndex:
+    """Elements and text the extractors need, collected in one tree walk."""
+
+    def __init__(self, soup: BeautifulSoup):
+        """
+        Build the index.
+
+        Args:
+            soup: BeautifulSoup parsed HTML
+        """
+        self.soup = soup
+
+        # First element matching each selector, keyed by selector
+        self.name_elements: Dict[str, Tag] = {}
+        self.address_elements: Dict[str, Tag] = {}
+
+        # First element with a schema.org PostalAddress itemtype
+        self.postal_address: Optional[Tag] = None
+
+        # Embedded structured data: JSON-LD script tags and the first
+        # Attorney/LegalService/Person microdata item
+        self.json_ld_scripts: List[Tag] = []
+        self.microdata_element: Optional[Tag] = None
+
+        # Outermost elements in practice-area sections; nested matches are
+        # skipped because their text is already part of their ancestor's
+        self.practice_elements: List[Tag] = []
+
+        self.meta_description: Optional[str] = None
+        self.first_mailto: Optional[Tag] = None
+        self.links: List[Tag] = []
+
+        self._text: Optional[str] = None
+        self._walk()
+
+    @property
+    def text(self) -> str:
+        """Full page text, built once on first use."""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    def _walk(self):
+        """Visit every element once and record the ones extractors use."""
+        name_elements = self.name_elements
+        address_elements = self.address_elements
+        practice_ids = set()
+
+        for tag in self.soup.find_all(True):
+            name = tag.name
+            classes = tag.get('class') or []
+
+            if name == 'h1':
+                self._record_h1(tag, classes)
+            elif name == 'a':
+                href = tag.get('href')
+                if href is not None:
+                    self.links.append(tag)
+                    if self.first_mailto is None and MAILTO_PATTERN.search(href):
+                        self.first_mailto = tag
+            elif name == 'meta':
+                if self.meta_description is None and tag.get('name') == 'description':
+                    self.meta_description = tag.get('content') or ''
+            elif name == 'script':
+                if (tag.get('type') or '').strip().lower() == 'application/ld+json':
+                    self.json_ld_scripts.append(tag)
+
+            itemprop = tag.get('itemprop')
+            if itemprop == 'name':
+                name_elements.setdefault('[itemprop="name"]', tag)
+            elif itemprop == 'address':
+                address_elements.setdefault('[itemprop="address"]', tag)
+
+            itemtype = tag.get('itemtype')
+            if itemtype is not None:
+                if self.postal_address is None and POSTAL_ADDRESS_PATTERN.search(itemtype):
+                    self.postal_address = tag
+                if (self.microdata_element is None and tag.has_attr('itemscope')
+                        and is_attorney_microdata(tag)):
+                    self.microdata_element = tag
+
+            if not classes:
+                continue
+
+            if 'lawyer-name' in classes:
+                name_elements.setdefault('.lawyer-name', tag)
+            if 'address' in classes:
+                address_elements.setdefault('.address', tag)
+            if 'location' in classes:
+                address_elements.setdefault('.location', tag)
+            if 'contact-info' in classes:
+                address_elements.setdefault('.contact-info', tag)
+
+            # Covers '.practice-areas', '.areas-of-practice', '.specialties'
+            # and '[class*="practice"]'
+            if 'specialties' in classes or 'practice' in ' '.join(classes):
+                if not any(id(parent) in practice_ids for parent in tag.parents):
+                    self.practice_elements.append(tag)
+                practice_ids.add(id(tag))
+
+    def _record_h1(self, tag: Tag, classes: List[str]):
+        """Record an h1 against every name selector it satisfies."""
+        name_elements = self.name_elements
+        name_elements.setdefault('h1', tag)
+        if 'attorney-name' in classes:
+            name_elements.setdefault('h1.attorney-name', tag)
+        if 'profile-name' in classes:
+            name_elements.setdefault('h1.profile-name', tag)
+
+        need_info = '.attorney-info h1' not in name_elements
+        need_header = '.profile-header h1' not in name_elements
+        if not (need_info or need_header):
+            return
+
+        for parent in tag.parents:
+            parent_classes = parent.get('class') or []
+            if need_info and 'attorney-info' in parent_classes:
+                name_elements['.attorney-info h1'] = tag
+                need_info = False
+            if need_header and 'profile-header' in parent_classes:
+                name_elements['.profile-header h1'] = tag
+                need_header = False
@@ -0,0 +1,401 @@
+"""
+Persistent, resumable crawl frontier for directory crawls.
+
+The frontier lives in SQLite next to the attorneys table. It holds a
+deduplicated queue of URLs with priorities and per-host next-allowed times,
+so a crawl of tens of thousands of profiles can be stopped and resumed
+without redoing finished work.
+
+Usage:
+    python frontier.py https://example.com/attorneys/
+"""
+import os
+import sys
+import time
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterable, Tuple
+from urllib.parse import urlparse
+
+from database import AttorneyDatabase
+from http_cache import normalize_url
+from scraper import AttorneyScraper, HostThrottle
+
+
+# Profiles are fetched before the listings that lead to more profiles, so
+# finished work accumulates steadily instead of the queue only growing
+PRIORITY_SEED = 5
+PRIORITY_PROFILE = 10
+PRIORITY_LISTING = 5
+
+
+class CrawlFrontier:
+    """SQLite-backed URL queue with per-host politeness."""
+
+    def __init__(self, db_path: str = "attorneys.db", delay: float = 2.0, max_attempts: int = 3):
+        """
+        Initialize frontier and create its tables if needed.
+
+        Args:
+            db_path: Path to the SQLite database (normally the attorneys database)
+            delay: Minimum seconds between requests to the same host
+            max_attempts: Attempts before a failing URL is given up on
+        """
+        self.db_path = db_path
+        self.delay = delay
+        self.max_attempts = max_attempts
+        self.init_frontier()
+
+    def init_frontier(self):
+        """Create frontier tables if they don't exist."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frontier_urls (
+                url TEXT PRIMARY KEY,
+                host TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                depth INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                discovered_from TEXT,
+                last_error TEXT,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_frontier_pending
+            ON frontier_urls(status, priority DESC, added_at)
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frontier_hosts (
+                host TEXT PRIMARY KEY,
+                next_allowed_at REAL NOT NULL DEFAULT 0
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def add_urls(
+        self,
+        urls: Iterable[str],
+        priority: int = PRIORITY_SEED,
+        depth: int = 0,
+        discovered_from: Optional[str] = None
+    ) -> int:
+        """
+        Queue URLs that haven't been seen before.
+
+        Args:
+            urls: URLs to queue
+            priority: Higher priorities are fetched first
+            depth: Link distance from the seed URLs
+            discovered_from: Page the URLs were found on
+
+        Returns:
+            Number of URLs newly added
+        """
+        return self.add_discovered([(url, priority, depth, discovered_from) for url in urls])
+
+    def add_discovered(self, entries: Iterable[Tuple[str, int, int, Optional[str]]]) -> int:
+        """
+        Queue a batch of URLs with individual priorities in one transaction.
+
+        Args:
+            entries: (url, priority, depth, discovered_from) tuples
+
+        Returns:
+            Number of URLs newly added
+        """
+        rows = []
+        for url, priority, depth, discovered_from in entries:
+            key = normalize_url(url)
+            rows.append((key, urlparse(key).netloc, priority, depth, discovered_from))
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        before = conn.total_changes
+        cursor.executemany('''
+            INSERT OR IGNORE INTO frontier_urls (url, host, priority, depth, discovered_from)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        added = conn.total_changes - before
+
+        conn.commit()
+        conn.close()
+
+        return added
+
+    def claim_batch(self, limit: int = 50, per_host: int = 5) -> List[Dict]:
+        """
+        Claim the next URLs to fetch.
+
+        Only hosts whose next-allowed time has passed are considered, and at
+        most ``per_host`` URLs are taken from each. Claimed hosts are pushed
+        back by ``delay`` per claimed URL, so other crawler processes sharing
+        the frontier stay polite too.
+
+        Args:
+            limit: Maximum number of URLs to claim
+            per_host: Maximum URLs claimed from a single host
+
+        Returns:
+            List of dictionaries with url, priority and depth
+        """
+        now = time.time()
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute('''
+            SELECT u.url, u.host, u.priority, u.depth
+            FROM frontier_urls u
+            LEFT JOIN frontier_hosts h ON h.host = u.host
+            WHERE u.status = 'pending' AND COALESCE(h.next_allowed_at, 0) <= ?
+            ORDER BY u.priority DESC, u.added_at
+            LIMIT ?
+        ''', (now, limit * per_host))
+
+        claimed = []
+        host_counts: Dict[str, int] = {}
+        for row in cursor.fetchall():
+            if host_counts.get(row['host'], 0) >= per_host:
+                continue
+            host_counts[row['host']] = host_counts.get(row['host'], 0) + 1
+            claimed.append(dict(row))
+            if len(claimed) >= limit:
+                break
+
+        cursor.executemany('''
+            UPDATE frontier_urls
+            SET status = 'in_progress', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE url = ?
+        ''', [(item['url'],) for item in claimed])
+
+        cursor.executemany('''
+            INSERT INTO frontier_hosts (host, next_allowed_at) VALUES (?, ?)
+            ON CONFLICT(host) DO UPDATE SET next_allowed_at = excluded.next_allowed_at
+        ''', [(host, now + self.delay * count) for host, count in host_counts.items()])
+
+        cursor.execute("COMMIT")
+        conn.close()
+
+        return claimed
+
+    def complete_batch(self, done: Iterable[str] = (), failed: Iterable[Tuple[str, str]] = ()):
+        """
+        Record the outcome of claimed URLs.
+
+        Failed URLs go back to the queue until they reach max_attempts.
+
+        Args:
+            done: URLs fetched successfully
+            failed: (url, error message) pairs
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            UPDATE frontier_urls
+            SET status = 'done', last_error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE url = ?
+        ''', [(normalize_url(url),) for url in done])
+
+        cursor.executemany('''
+            UPDATE frontier_urls
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                last_error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE url = ?
+        ''', [(self.max_attempts, error, normalize_url(url)) for url, error in failed])
+
+        conn.commit()
+        conn.close()
+
+    def recover(self) -> int:
+        """
+        Requeue URLs claimed by a crawl that stopped before finishing them.
+
+        Returns:
+            Number of URLs requeued
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE frontier_urls SET status = 'pending', updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'in_progress'
+        ''')
+        recovered = cursor.rowcount
+
+        conn.commit()
+        conn.close()
+
+        return recovered
+
+    def next_ready_in(self) -> Optional[float]:
+        """
+        Seconds until some pending URL's host may be fetched again.
+
+        Returns:
+            Seconds to wait (0 if something is ready now), or None if the
+            queue is empty
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT MIN(COALESCE(h.next_allowed_at, 0))
+            FROM frontier_urls u
+            LEFT JOIN frontier_hosts h ON h.host = u.host
+            WHERE u.status = 'pending'
+        ''')
+        next_allowed = cursor.fetchone()[0]
+
+        conn.close()
+
+        if next_allowed is None:
+            return None
+        return max(0.0, next_allowed - time.time())
+
+    def get_stats(self) -> Dict:
+        """Get frontier statistics (URL counts by status)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT status, COUNT(*) FROM frontier_urls GROUP BY status")
+        stats = {status: 0 for status in ('pending', 'in_progress', 'done', 'failed')}
+        stats.update(dict(cursor.fetchall()))
+
+        conn.close()
+
+        return stats
+
+
+async def crawl_frontier(
+    frontier: CrawlFrontier,
+    scraper: AttorneyScraper,
+    db: AttorneyDatabase,
+    batch_size: int = 50,
+    max_depth: int = 3,
+    max_pages: Optional[int] = None
+) -> int:
+    """
+    Crawl until the frontier is exhausted (or max_pages are fetched).
+
+    Each batch is claimed, fetched concurrently with per-host spacing, and
+    then written back in one go: outcomes, newly discovered links and the
+    extracted attorneys.
+
+    Args:
+        frontier: Frontier to drain
+        scraper: Scraper used for fetching and extraction
+        db: Database the extracted attorneys are stored in
+        batch_size: URLs claimed per batch
+        max_depth: Links on pages at this depth are not followed
+        max_pages: Stop after fetching this many pages
+
+    Returns:
+        Number of pages fetched
+    """
+    recovered = frontier.recover()
+    if recovered:
+        print(f"Resuming crawl: requeued {recovered} unfinished URL(s)")
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=scraper.max_concurrency)
+    slots = asyncio.Semaphore(scraper.max_concurrency)
+    throttle = HostThrottle(scraper.delay)
+    fetched_pages = 0
+
+    async def crawl_one(item: Dict):
+        url = item['url']
+        await throttle.acquire(url, slots)
+        try:
+            fetched = await loop.run_in_executor(executor, scraper.fetch, url)
+        finally:
+            slots.release()
+
+        # Unchanged pages (304) reuse their records, but their links are
+        # still read: the page may have been cached by /scrape rather than
+        # by a crawl, so its links may never have been queued
+        if fetched.records is not None:
+            if item['depth'] >= max_depth:
+                return fetched.records, []
+            links = await loop.run_in_executor(executor, scraper.discover_links, fetched.content, url)
+            return fetched.records, links
+
+        attorneys, links = await loop.run_in_executor(
+            executor, scraper.parse_with_links, fetched.content, url
+        )
+        scraper.remember(url, attorneys)
+        return attorneys, links
+
+    try:
+        while max_pages is None or fetched_pages < max_pages:
+            limit = batch_size if max_pages is None else min(batch_size, max_pages - fetched_pages)
+            batch = frontier.claim_batch(limit)
+            if not batch:
+                wait = frontier.next_ready_in()
+                if wait is None:
+                    break
+                await asyncio.sleep(max(wait, 0.1))
+                continue
+
+            results = await asyncio.gather(
+                *(crawl_one(item) for item in batch),
+                return_exceptions=True
+            )
+            fetched_pages += len(batch)
+
+            done, failed, attorneys, discovered = [], [], [], []
+            for item, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    failed.append((item['url'], str(result)))
+                    continue
+
+                page_attorneys, links = result
+                done.append(item['url'])
+                attorneys.extend(page_attorneys)
+
+                if item['depth'] < max_depth:
+                    for link, kind in links:
+                        priority = PRIORITY_PROFILE if kind == 'profile' else PRIORITY_LISTING
+                        discovered.append((link, priority, item['depth'] + 1, item['url']))
+
+            frontier.add_discovered(discovered)
+            frontier.complete_batch(done, failed)
+            counts = db.add_attorneys_many(attorneys)
+
+            print(f"Fetched {len(done)} page(s), {len(failed)} failed, "
+                  f"{len(attorneys)} attorney(s) found ({counts['inserted']} new, "
+                  f"{counts['updated']} updated); frontier: {frontier.get_stats()}")
+    finally:
+        executor.shutdown(wait=False)
+
+    return fetched_pages
+
+
+def main():
+    """Seed the frontier from the command line and crawl it."""
+    db_path = os.getenv('DATABASE_PATH', 'attorneys.db')
+    delay = float(os.getenv('SCRAPE_DELAY_SECONDS', '2'))
+
+    frontier = CrawlFrontier(db_path, delay=delay)
+    added = frontier.add_urls(sys.argv[1:], PRIORITY_SEED)
+    if sys.argv[1:]:
+        print(f"Added {added} seed URL(s)")
+
+    scraper = AttorneyScraper(delay=delay, extraction_mode=os.getenv('SCRAPE_MODE', 'auto'))
+    asyncio.run(crawl_frontier(frontier, scraper, AttorneyDatabase(db_path)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Offline ZIP code geography for radius searches.
+
+Attorneys are placed at the centroid of their ZIP code. The bundled
+data/zip_centroids.csv covers every US ZIP code with GeoNames coordinates
+(CC BY 4.0). The Census Bureau's ZCTA Gazetteer file, which is public
+domain, can be loaded over it with:
+
+    python src/geo.py 2023_Gaz_zcta_national.txt
+
+Download it from
+https://www.census.gov/geographies/reference-files/time-series/geo/gazetteer-files.html
+"""
+import csv
+import gzip
+import math
+import os
+import sys
+from typing import Iterator, Tuple
+
+
+EARTH_RADIUS_MILES = 3958.8
+
+ZIP_CENTROIDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'zip_centroids.csv')
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points.
+
+    Args:
+        lat1: Latitude of the first point, in degrees
+        lon1: Longitude of the first point, in degrees
+        lat2: Latitude of the second point, in degrees
+        lon2: Longitude of the second point, in degrees
+
+    Returns:
+        Distance in miles
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, miles: float) -> Tuple[float, float, float, float]:
+    """
+    Latitude/longitude box containing every point within a distance.
+
+    The box is a little larger than the circle; candidates found with it
+    still need an exact distance check.
+
+    Args:
+        lat: Latitude of the center, in degrees
+        lon: Longitude of the center, in degrees
+        miles: Radius in miles
+
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon)
+    """
+    dlat = math.degrees(miles / EARTH_RADIUS_MILES)
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+
+    # Degrees of longitude shrink towards the poles; near them (or for
+    # huge radii) any longitude can be in range
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 0 or miles / (EARTH_RADIUS_MILES * cos_lat) >= math.pi:
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(miles / (EARTH_RADIUS_MILES * cos_lat))
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+
+def read_zip_centroids(path: str) -> Iterator[Tuple[str, float, float]]:
+    """
+    Read ZIP centroids from a Census Gazetteer ZCTA file or a CSV.
+
+    Gazetteer files are tab-separated with GEOID, INTPTLAT and INTPTLONG
+    columns. Other files are comma-separated with zip, latitude and
+    longitude columns; lines starting with '#' are comments. Either may be
+    gzip-compressed (.gz).
+
+    Args:
+        path: Path to the centroid file
+
+    Yields:
+        Tuples of (5-digit ZIP, latitude, longitude)
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        lines = (line for line in f if line.strip() and not line.startswith('#'))
+        header = next(lines, '')
+        delimiter = '\t' if '\t' in header else ','
+        # Gazetteer headers carry trailing padding
+        columns = [column.strip().lower() for column in header.split(delimiter)]
+
+        if 'geoid' in columns:
+            zip_index, lat_index, lon_index = (
+                columns.index('geoid'), columns.index('intptlat'), columns.index('intptlong')
+            )
+        else:
+            zip_index, lat_index, lon_index = (
+                columns.index('zip'), columns.index('latitude'), columns.index('longitude')
+            )
+
+        for row in csv.reader(lines, delimiter=delimiter):
+            try:
+                zip_code = row[zip_index].strip().zfill(5)
+                yield zip_code, float(row[lat_index]), float(row[lon_index])
+            except (IndexError, ValueError):
+                continue
+
+
+def main():
+    """Load a ZIP centroid file into the attorney database."""
+    if len(sys.argv) != 2:
+        print("Usage: python src/geo.py <zip centroid file>")
+        sys.exit(1)
+
+    from database import AttorneyDatabase
+
+    db = AttorneyDatabase(os.getenv('DATABASE_PATH', 'attorneys.db'))
+    count = db.load_zip_centroids(sys.argv[1])
+    print(f"Loaded {count} ZIP centroids")
+
+
+if __name__ == '__main__':
+    main()
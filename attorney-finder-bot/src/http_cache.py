@@ -0,0 +1,236 @@
+"""
+Persistent HTTP response cache for the scraper.
+
+Responses are stored in SQLite keyed by normalized URL, together with their
+validators (ETag / Last-Modified) and the attorney records extracted from
+them (and the extraction mode that produced them). Re-scraping sends a
+conditional request; a 304 reuses both the cached body and the cached
+extraction.
+"""
+import json
+import sqlite3
+import time
+from typing import List, Dict, Optional, Iterator
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+
+    Lowercases the scheme and host, drops default ports and the fragment,
+    sorts query parameters and gives an empty path a trailing slash.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class ResponseCache:
+    """Size-bounded, least-recently-used cache of scraped responses."""
+
+    def __init__(self, db_path: str = "scrape_cache.db", max_bytes: int = 200 * 1024 * 1024):
+        """
+        Initialize cache and create its table if needed.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            max_bytes: Total body size to keep before evicting old entries
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.init_cache()
+
+    def init_cache(self):
+        """Create cache tables if they don't exist."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                records TEXT,
+                extractor_version INTEGER,
+                extraction_mode TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)
+        ''')
+
+        # Caches created before records were tagged with their mode
+        cursor.execute("PRAGMA table_info(responses)")
+        if not any(row[1] == 'extraction_mode' for row in cursor.fetchall()):
+            cursor.execute("ALTER TABLE responses ADD COLUMN extraction_mode TEXT")
+
+        # Running total of body sizes, so eviction doesn't sum the table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_size (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO cache_size (id, total)
+            SELECT 1, COALESCE(SUM(size), 0) FROM responses
+            WHERE NOT EXISTS (SELECT 1 FROM cache_size)
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses BEGIN
+                UPDATE cache_size SET total = total + new.size WHERE id = 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses BEGIN
+                UPDATE cache_size SET total = total - old.size + new.size WHERE id = 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses BEGIN
+                UPDATE cache_size SET total = total - old.size WHERE id = 1;
+            END
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached response and mark it as recently used.
+
+        Args:
+            url: URL to look up
+
+        Returns:
+            Dictionary with body, etag, last_modified, records,
+            extractor_version and extraction_mode, or None if not cached
+        """
+        key = normalize_url(url)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT body, etag, last_modified, records, extractor_version, extraction_mode
+            FROM responses WHERE url = ?
+        ''', (key,))
+        row = cursor.fetchone()
+
+        if row:
+            cursor.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), key))
+            conn.commit()
+
+        conn.close()
+
+        if not row:
+            return None
+
+        entry = dict(row)
+        entry['records'] = json.loads(entry['records']) if entry['records'] is not None else None
+        return entry
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a freshly downloaded response, replacing any cached extraction.
+
+        Args:
+            url: URL the response came from
+            body: Response body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        now = time.time()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old
+        # row without firing the delete trigger that keeps cache_size right
+        cursor.execute('''
+            INSERT INTO responses (
+                url, body, etag, last_modified, records, extractor_version,
+                extraction_mode, size, fetched_at, accessed_at
+            ) VALUES (?, ?, ?, ?, NULL, NULL, NULL, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                body = excluded.body,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                records = NULL,
+                extractor_version = NULL,
+                extraction_mode = NULL,
+                size = excluded.size,
+                fetched_at = excluded.fetched_at,
+                accessed_at = excluded.accessed_at
+        ''', (normalize_url(url), body, etag, last_modified, len(body), now, now))
+
+        self._evict(cursor)
+
+        conn.commit()
+        conn.close()
+
+    def store_records(self, url: str, records: List[Dict], extractor_version: int,
+                      extraction_mode: str):
+        """
+        Attach extracted attorney records to a cached response.
+
+        Args:
+            url: URL the records were extracted from
+            records: Attorney data dictionaries
+            extractor_version: Version of the extractors that produced them
+            extraction_mode: Scraper extraction mode that produced them
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE responses SET records = ?, extractor_version = ?, extraction_mode = ?
+            WHERE url = ?
+        ''', (json.dumps(records), extractor_version, extraction_mode, normalize_url(url)))
+
+        conn.commit()
+        conn.close()
+
+    def urls(self) -> Iterator[str]:
+        """Iterate over every cached URL, e.g. for offline re-extraction."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for (url,) in conn.execute("SELECT url FROM responses ORDER BY url"):
+                yield url
+        finally:
+            conn.close()
+
+    def _evict(self, cursor: sqlite3.Cursor):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        cursor.execute("SELECT total FROM cache_size WHERE id = 1")
+        total = cursor.fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for url, size in cursor.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+
+        cursor.executemany("DELETE FROM responses WHERE url = ?", evicted)
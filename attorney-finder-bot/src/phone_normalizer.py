@@ -0,0 +1,124 @@
+"""
+Phone number matching and normalization shared by all extractors.
+
+phonenumbers parsing is the most expensive step of extraction on pages full
+of numbers, and the same office and fax numbers repeat across every page of
+a firm's site. Normalized results are kept in a bounded LRU cache that is
+shared by every scraper and worker thread in the process (each parse worker
+process has its own).
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+import phonenumbers
+
+
+# One pattern covering (123) 456-7890, 123-456-7890, 123.456.7890 and
+# +1-123-456-7890 style numbers
+PHONE_PATTERN = re.compile(r'(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
+PHONE_CACHE_SIZE = 4096
+
+_failures_lock = threading.Lock()
+_parse_failures = 0
+
+
+def find_phone_numbers(text: str, limit: int = 5) -> List[str]:
+    """
+    Find, validate and format the phone numbers in a block of text.
+
+    Args:
+        text: Text to search
+        limit: Maximum number of numbers to return
+
+    Returns:
+        Unique numbers in US national format, in order of first appearance
+    """
+    phones = []
+    seen = set()
+    for match in PHONE_PATTERN.findall(text):
+        key = _cache_key(match)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        formatted = _normalize(key)
+        if formatted and formatted not in phones:
+            phones.append(formatted)
+            if len(phones) >= limit:
+                break
+
+    return phones
+
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """
+    Validate a raw phone number and format it in US national format.
+
+    Args:
+        raw: Phone number as written on the page
+
+    Returns:
+        Formatted number, or None if it is not a valid number
+    """
+    return _normalize(_cache_key(raw))
+
+
+def phone_cache_stats() -> Dict:
+    """Hit/miss counters for the normalization cache and the number of unparseable numbers seen."""
+    info = _normalize_key.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'parse_failures': _parse_failures
+    }
+
+
+def _cache_key(raw: str) -> str:
+    """
+    Reduce a raw number to the characters phonenumbers actually uses.
+
+    Different spellings of the same number ("(510) 555-1234",
+    "510.555.1234") then share one cache entry.
+    """
+    digits = NON_DIGIT_PATTERN.sub('', raw)
+    return '+' + digits if raw.lstrip().startswith('+') else digits
+
+
+def _normalize(key: str) -> Optional[str]:
+    """
+    Normalize a cache key, counting parse failures.
+
+    Failures are counted here rather than in the memoized parse, so a
+    repeated unparseable number counts every time it is seen.
+    """
+    global _parse_failures
+    formatted, parsed = _normalize_key(key)
+    if not parsed:
+        with _failures_lock:
+            _parse_failures += 1
+    return formatted
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize_key(key: str) -> Tuple[Optional[str], bool]:
+    """
+    Parse, validate and format a cache key; results are memoized.
+
+    Returns:
+        Tuple of (formatted number or None, whether phonenumbers could
+        parse the key at all)
+    """
+    try:
+        parsed = phonenumbers.parse(key, "US")
+    except phonenumbers.NumberParseException:
+        return None, False
+
+    if not phonenumbers.is_valid_number(parsed):
+        return None, True
+
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL), True
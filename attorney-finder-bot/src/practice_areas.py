@@ -0,0 +1,113 @@
+"""
+Practice-area taxonomy shared by the scraper and the search query parser.
+
+Each canonical practice area lists the terms that refer to it. All terms are
+compiled into a single case-insensitive alternation with word boundaries, so
+matching is one regex pass over the text however large the taxonomy grows.
+"""
+import re
+from typing import List, Dict, Optional, Tuple
+
+
+# Canonical practice area -> terms that refer to it (the canonical name is
+# always matched too)
+PRACTICE_AREA_TAXONOMY = {
+    'Criminal': ['criminal', 'criminal defense', 'criminal law'],
+    'Family': ['family', 'family law', 'divorce', 'child custody', 'custody',
+               'child support', 'alimony', 'spousal support'],
+    'Personal Injury': ['personal injury', 'accident', 'car accident',
+                        'auto accident', 'wrongful death', 'slip and fall'],
+    'DUI/DWI': ['dui', 'dwi', 'drunk driving', 'owi'],
+    'Immigration': ['immigration', 'visa', 'green card', 'deportation',
+                    'asylum', 'citizenship'],
+    'Bankruptcy': ['bankruptcy', 'chapter 7', 'chapter 11', 'chapter 13',
+                   'debt relief'],
+    'Estate Planning': ['estate planning', 'wills', 'trusts', 'probate',
+                        'wills and trusts'],
+    'Real Estate': ['real estate', 'property law', 'landlord tenant',
+                    'landlord-tenant'],
+    'Business': ['business', 'business law', 'contracts'],
+    'Corporate': ['corporate', 'corporate law', 'mergers and acquisitions',
+                  'securities'],
+    'Employment': ['employment', 'employment law', 'labor law',
+                   'wrongful termination', 'discrimination', 'harassment'],
+    'Civil': ['civil', 'civil rights'],
+    'Litigation': ['litigation', 'civil litigation', 'trial lawyer'],
+    'Medical Malpractice': ['medical malpractice', 'malpractice',
+                            'medical negligence'],
+    'Workers Compensation': ['workers compensation', "workers' compensation",
+                             'workers comp', 'workplace injury'],
+    'Tax': ['tax', 'tax law', 'irs'],
+    'Intellectual Property': ['intellectual property', 'patent', 'patents',
+                              'trademark', 'trademarks', 'copyright'],
+}
+
+
+class PracticeAreaMatcher:
+    """Single-pass matcher mapping practice-area terms to canonical names."""
+
+    def __init__(self, taxonomy: Dict[str, List[str]] = PRACTICE_AREA_TAXONOMY):
+        """
+        Compile the taxonomy.
+
+        Args:
+            taxonomy: Canonical practice area -> list of synonyms
+        """
+        self.canonical: Dict[str, str] = {}
+        for area, terms in taxonomy.items():
+            for term in [area] + list(terms):
+                self.canonical.setdefault(self._normalize(term), area)
+
+        # Longest terms first so "family law" wins over "family" at the same
+        # position; whitespace in terms matches any run of whitespace
+        terms = sorted(self.canonical, key=len, reverse=True)
+        alternation = '|'.join(
+            r'\s+'.join(re.escape(word) for word in term.split())
+            for term in terms
+        )
+        self.pattern = re.compile(r'(?<!\w)(?:' + alternation + r')(?!\w)', re.IGNORECASE)
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Find every practice area mentioned in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Canonical practice areas in order of first mention
+        """
+        areas = []
+        for match in self.pattern.finditer(text):
+            area = self.canonical[self._normalize(match.group())]
+            if area not in areas:
+                areas.append(area)
+        return areas
+
+    def search(self, text: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Find the first practice area mentioned in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Tuple of (canonical area, match start, match end), or None
+        """
+        match = self.pattern.search(text)
+        if not match:
+            return None
+        return self.canonical[self._normalize(match.group())], match.start(), match.end()
+
+    def canonicalize(self, term: str) -> Optional[str]:
+        """Canonical practice area for a single term, or None if unknown."""
+        return self.canonical.get(self._normalize(term))
+
+    @staticmethod
+    def _normalize(term: str) -> str:
+        """Lowercase and collapse whitespace."""
+        return ' '.join(term.lower().split())
+
+
+# Shared matcher, compiled once per process
+practice_area_matcher = PracticeAreaMatcher()
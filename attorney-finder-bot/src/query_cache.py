@@ -0,0 +1,93 @@
+"""
+In-memory cache of search results.
+
+Popular searches repeat constantly, so their result pages are kept in a
+least-recently-used cache with a time-to-live. Every entry records the
+database write generation it was computed at; any write moves the
+generation on, so a cached page is never served after the data changed.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class QueryCache:
+    """Thread-safe LRU cache with a TTL and write-generation invalidation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Entries to keep before evicting the least recently
+                used (0 disables the cache)
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # key -> (expiry time, generation, value)
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, generation: Hashable) -> Optional[Any]:
+        """
+        Cached value for a key, if still valid.
+
+        Args:
+            key: Cache key
+            generation: Current write generation of the data
+
+        Returns:
+            Cached value, or None if missing, expired or computed at an
+            older generation
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, entry_generation, value = entry
+                if expires > time.monotonic() and entry_generation == generation:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, generation: Hashable, value: Any):
+        """
+        Store a value computed at a write generation.
+
+        Args:
+            key: Cache key
+            generation: Write generation the value was computed at
+            value: Value to cache
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,136 @@
+"""
+Detection of firm roster pages ("Our Attorneys") and their attorney cards.
+
+A roster repeats the same card structure for every lawyer: sibling elements
+of the same kind under one parent, each holding a name and some
+contact signal (phone, email or a profile link). Finding that group lets a
+single fetch yield one record per attorney.
+"""
+import re
+from typing import List, Optional
+from bs4 import Tag
+
+from extraction import MAILTO_PATTERN, PROFILE_PATH_PATTERN
+from phone_normalizer import PHONE_PATTERN
+
+
+# Fewest repeated cards that count as a roster
+ROSTER_MIN_CARDS = 3
+
+# Cards longer than this are page sections, not attorney cards
+MAX_CARD_TEXT = 3000
+
+# Elements never used as cards
+NON_CARD_TAGS = {'script', 'style', 'option', 'br', 'hr', 'meta', 'link', 'img', 'svg', 'path'}
+
+NAME_HEADINGS = {'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# Page headings that announce a roster
+ROSTER_HEADING_PATTERN = re.compile(
+    r'\b(?:attorneys|lawyers|our team|our people|people|professionals|directory|counsel)\b',
+    re.IGNORECASE
+)
+
+
+def find_roster_cards(root: Tag, min_cards: int = ROSTER_MIN_CARDS) -> List[Tag]:
+    """
+    Find the largest group of repeated attorney cards on a page.
+
+    Every element's children are grouped by tag name (modifier classes such
+    as "card featured" vary between cards of one roster); groups where at
+    least ``min_cards`` members look like attorney cards are candidates, and
+    the one with the most such cards wins. Each element is visited once as a
+    child, so detection is linear in page size.
+
+    Args:
+        root: Page (or section) to search
+        min_cards: Minimum number of cards for a roster
+
+    Returns:
+        Card elements in document order, or an empty list if no roster
+    """
+    best: List[Tag] = []
+    for parent in root.find_all(True):
+        groups = {}
+        for child in parent.find_all(True, recursive=False):
+            if child.name in NON_CARD_TAGS:
+                continue
+            groups.setdefault(child.name, []).append(child)
+
+        for members in groups.values():
+            if len(members) < min_cards or len(members) <= len(best):
+                continue
+            cards = [member for member in members if looks_like_card(member)]
+            if len(cards) >= min_cards and len(cards) > len(best):
+                best = cards
+
+    return best
+
+
+def looks_like_card(elem: Tag) -> bool:
+    """Whether an element holds a name plus a phone, email or profile link."""
+    text = elem.get_text(' ', strip=True)
+    if not text or len(text) > MAX_CARD_TEXT:
+        return False
+    if card_name(elem) is None:
+        return False
+
+    if PHONE_PATTERN.search(text):
+        return True
+    for link in elem.find_all('a', href=True):
+        if MAILTO_PATTERN.search(link['href']) or PROFILE_PATH_PATTERN.search(link['href']):
+            return True
+    return False
+
+
+def card_name(card: Tag) -> Optional[str]:
+    """
+    Find the attorney name inside a card.
+
+    Tries, in order: itemprop="name", elements whose class mentions "name",
+    headings, profile link text, then bold text.
+
+    Args:
+        card: Card element
+
+    Returns:
+        Name, or None if the card has no plausible name
+    """
+    headings = []
+    profile_links = []
+    bold = []
+
+    for elem in card.find_all(True):
+        classes = elem.get('class') or []
+        if elem.get('itemprop') == 'name' or any('name' in cls for cls in classes):
+            name = _valid_name(elem.get_text(' ', strip=True))
+            if name:
+                return name
+        if elem.name in NAME_HEADINGS:
+            headings.append(elem)
+        elif elem.name == 'a' and PROFILE_PATH_PATTERN.search(elem.get('href') or ''):
+            profile_links.append(elem)
+        elif elem.name in ('strong', 'b'):
+            bold.append(elem)
+
+    for elem in headings + profile_links + bold:
+        name = _valid_name(elem.get_text(' ', strip=True))
+        if name:
+            return name
+
+    return None
+
+
+def is_roster_heading(text: str) -> bool:
+    """Whether a page heading announces a list of attorneys."""
+    return bool(ROSTER_HEADING_PATTERN.search(text))
+
+
+def _valid_name(text: str) -> Optional[str]:
+    """Apply the same sanity checks as profile name extraction."""
+    text = ' '.join(text.split())
+    if not text or len(text) >= 100:
+        return None
+    if text.lower().startswith(('search', 'find', 'contact', 'view', 'read more', 'more')):
+        return None
+    return text
@@ -0,0 +1,403 @@
+"""
+Persistent queue of /scrape requests and the worker that drains it.
+
+/scrape only records a job and returns, so the webhook answers Telegram
+right away however slow the page is. Jobs live in SQLite next to the
+attorneys table; a worker claims them with bounded concurrency, scrapes and
+stores the attorneys, and messages the user as each job finishes.
+
+Claims are leases: a job claimed by a worker that died becomes claimable
+again once its lease runs out, so several workers can share the queue and
+none of them needs to clean up after another.
+
+The polling bot runs a worker itself. With the webhook, run one separately:
+    python scrape_jobs.py
+"""
+import os
+import json
+import time
+import asyncio
+import sqlite3
+from typing import List, Dict, Optional, Iterable
+
+from send_scheduler import PRIORITY_BULK
+
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_LEASE_SECONDS = 600.0
+# A failed job waits RETRY_DELAY_SECONDS, then twice that, and so on
+RETRY_DELAY_SECONDS = 30.0
+
+
+class ScrapeJobQueue:
+    """SQLite-backed queue of URLs to scrape for a chat."""
+
+    def __init__(
+        self,
+        db_path: str = "attorneys.db",
+        max_attempts: int = 3,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        """
+        Initialize queue and create its table if needed.
+
+        Args:
+            db_path: Path to the SQLite database (normally the attorneys database)
+            max_attempts: Attempts before a failing job is given up on
+            lease_seconds: Seconds a claimed job stays with its worker
+                before another worker may claim it
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.init_queue()
+
+    def init_queue(self):
+        """Create the job table if it doesn't exist."""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                chat_id INTEGER NOT NULL,
+                batch_id INTEGER,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                result TEXT,
+                last_error TEXT,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Claimable jobs: pending ones, and claimed ones whose lease ran out
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scrape_jobs_open
+            ON scrape_jobs(available_at, id) WHERE status IN ('pending', 'in_progress')
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def enqueue(self, urls: Iterable[str], chat_id: int) -> List[int]:
+        """
+        Queue URLs to scrape for a chat, as one batch.
+
+        Args:
+            urls: URLs to scrape
+            chat_id: Chat to notify as each job finishes
+
+        Returns:
+            IDs of the new jobs, in the order of urls
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        job_ids = []
+        for url in urls:
+            cursor.execute(
+                "INSERT INTO scrape_jobs (url, chat_id, batch_id) VALUES (?, ?, ?)",
+                (url, chat_id, job_ids[0] if job_ids else None)
+            )
+            job_ids.append(cursor.lastrowid)
+
+        # A batch is identified by its first job
+        if job_ids:
+            cursor.execute("UPDATE scrape_jobs SET batch_id = ? WHERE id = ?", (job_ids[0], job_ids[0]))
+
+        conn.commit()
+        conn.close()
+
+        return job_ids
+
+    def claim(self, limit: int) -> List[Dict]:
+        """
+        Claim the oldest claimable jobs.
+
+        Args:
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            List of dictionaries with id, url, chat_id, batch_id and attempts
+            (counting this one)
+        """
+        if limit <= 0:
+            return []
+
+        now = time.time()
+        conn = self._connect(isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute('''
+            SELECT id, url, chat_id, batch_id, attempts + 1 AS attempts
+            FROM scrape_jobs
+            WHERE status IN ('pending', 'in_progress') AND available_at <= ?
+            ORDER BY available_at, id
+            LIMIT ?
+        ''', (now, limit))
+        claimed = [dict(row) for row in cursor.fetchall()]
+
+        cursor.executemany('''
+            UPDATE scrape_jobs
+            SET status = 'in_progress', attempts = attempts + 1, available_at = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', [(now + self.lease_seconds, job['id']) for job in claimed])
+
+        cursor.execute("COMMIT")
+        conn.close()
+
+        return claimed
+
+    def complete(self, job_id: int, result: Dict):
+        """
+        Record a finished job.
+
+        Args:
+            job_id: Job that finished
+            result: Outcome to keep with the job (e.g. attorney counts)
+        """
+        conn = self._connect()
+        conn.execute('''
+            UPDATE scrape_jobs
+            SET status = 'done', result = ?, last_error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (json.dumps(result), job_id))
+        conn.commit()
+        conn.close()
+
+    def fail(self, job_id: int, error: str) -> bool:
+        """
+        Record a failed attempt; the job is retried later until max_attempts.
+
+        Args:
+            job_id: Job that failed
+            error: Error message
+
+        Returns:
+            True if the job will be retried, False if it was given up on
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT attempts FROM scrape_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        retrying = row is not None and row[0] < self.max_attempts
+        delay = RETRY_DELAY_SECONDS * 2 ** (row[0] - 1) if retrying else 0
+
+        cursor.execute('''
+            UPDATE scrape_jobs
+            SET status = ?, available_at = ?, last_error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', ('pending' if retrying else 'failed', time.time() + delay, error, job_id))
+
+        conn.commit()
+        conn.close()
+
+        return retrying
+
+    def release(self, job_ids: Iterable[int]):
+        """
+        Return claimed jobs to the queue without counting the attempt.
+
+        Args:
+            job_ids: Jobs a stopping worker didn't finish
+        """
+        conn = self._connect()
+        conn.executemany('''
+            UPDATE scrape_jobs
+            SET status = 'pending', attempts = attempts - 1, available_at = 0,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'in_progress'
+        ''', [(job_id,) for job_id in job_ids])
+        conn.commit()
+        conn.close()
+
+    def batch_remaining(self, batch_id: int) -> int:
+        """Number of jobs of a batch that haven't finished."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*) FROM scrape_jobs
+            WHERE batch_id = ? AND status IN ('pending', 'in_progress')
+        ''', (batch_id,))
+        remaining = cursor.fetchone()[0]
+        conn.close()
+        return remaining
+
+    def get_stats(self) -> Dict:
+        """Get queue statistics (job counts by status)."""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT status, COUNT(*) FROM scrape_jobs GROUP BY status")
+        stats = {status: 0 for status in ('pending', 'in_progress', 'done', 'failed')}
+        stats.update(dict(cursor.fetchall()))
+
+        conn.close()
+
+        return stats
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a connection that waits out other writers instead of failing."""
+        return sqlite3.connect(self.db_path, timeout=30, **kwargs)
+
+
+class ScrapeJobWorker:
+    """Drains the scrape job queue with bounded concurrency and notifies users."""
+
+    def __init__(
+        self,
+        queue: ScrapeJobQueue,
+        scrape_pool,
+        db,
+        bot,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        poll_interval: float = 2.0
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Queue to drain
+            scrape_pool: ScrapeWorkerPool the pages are scraped on
+            db: AsyncAttorneyDatabase the attorneys are stored in
+            bot: Bot sending the notifications (an ExtBot, so notifications
+                can be marked as bulk for the send scheduler)
+            concurrency: Jobs processed at the same time
+            poll_interval: Seconds between checks of an idle queue
+        """
+        self.queue = queue
+        self.scrape_pool = scrape_pool
+        self.db = db
+        self.bot = bot
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def wake(self):
+        """Check the queue now rather than at the next poll (call from the worker's loop)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self):
+        """Process jobs until cancelled; unfinished claims go back to the queue."""
+        self._wakeup = asyncio.Event()
+        running: Dict[asyncio.Task, int] = {}
+
+        def finished(task: asyncio.Task):
+            running.pop(task, None)
+            self._wakeup.set()
+
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    jobs = await asyncio.to_thread(self.queue.claim, self.concurrency - len(running))
+                except sqlite3.Error as e:
+                    print(f"Error claiming scrape jobs: {e}")
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(self.run_job(job))
+                    running[task] = job['id']
+                    task.add_done_callback(finished)
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(running):
+                task.cancel()
+            self.queue.release(running.values())
+
+    async def run_job(self, job: Dict):
+        """Scrape one job's URL, store the attorneys and notify its chat."""
+        url = job['url']
+        try:
+            attorneys = await self.scrape_pool.scrape(url, raise_errors=True)
+            counts = await self.db.add_attorneys_many(attorneys) if attorneys else None
+        except Exception as e:
+            if await asyncio.to_thread(self.queue.fail, job['id'], str(e)):
+                print(f"Scrape job {job['id']} failed (attempt {job['attempts']}), will retry: {e}")
+                return
+            text = f"❌ Error scraping {url}: {e}"
+        else:
+            result = {'found': len(attorneys)}
+            if counts:
+                result.update(counts)
+            await asyncio.to_thread(self.queue.complete, job['id'], result)
+            text = _result_message(url, result)
+
+        remaining = await asyncio.to_thread(self.queue.batch_remaining, job['batch_id'])
+        if remaining:
+            text += f"\n\n⏳ {remaining} more URL(s) from this batch still queued."
+        await self.notify(job['chat_id'], text)
+
+    async def notify(self, chat_id: int, text: str):
+        """Message a chat about a job, behind any interactive replies."""
+        try:
+            await self.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                disable_web_page_preview=True,
+                rate_limit_args=PRIORITY_BULK
+            )
+        except Exception as e:
+            print(f"Error notifying chat {chat_id}: {e}")
+
+
+def _result_message(url: str, result: Dict) -> str:
+    """Notification text for a finished job."""
+    if not result['found']:
+        return (
+            f"❌ Could not extract attorney information from {url}\n\n"
+            "Please make sure the URL contains attorney contact details."
+        )
+    return (
+        f"✅ Added {result['found']} attorney(s) from {url}\n"
+        f"({result.get('inserted', 0)} new, {result.get('updated', 0)} updated)\n\n"
+        "Use /search to find them."
+    )
+
+
+def main():
+    """Run a standalone worker for the webhook deployment."""
+    from dotenv import load_dotenv
+    from telegram.ext import Application
+    from send_scheduler import SendScheduler
+    from bot_handlers import get_db, get_scrape_pool, get_scrape_jobs, shutdown_handlers
+
+    load_dotenv()
+    token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not token:
+        raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
+
+    async def run():
+        application = Application.builder().token(token).rate_limiter(SendScheduler()).build()
+        async with application:
+            worker = ScrapeJobWorker(
+                get_scrape_jobs(),
+                get_scrape_pool(),
+                get_db(),
+                application.bot,
+                concurrency=int(os.getenv('SCRAPE_JOB_WORKERS', str(DEFAULT_CONCURRENCY)))
+            )
+            print(f"Scrape worker started; queue: {worker.queue.get_stats()}")
+            await worker.run()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_handlers()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Worker pools for running scrapes off the bot's event loop.
+
+Downloads run on a thread pool, and the CPU-heavy BeautifulSoup parse and
+field extraction run on a process pool, so a slow scrape never stalls the
+handlers serving other chats.
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional
+
+from scraper import AttorneyScraper, HostThrottle
+
+
+# Scraper instance owned by each parse worker process
+_worker_scraper: Optional[AttorneyScraper] = None
+
+
+def _init_parse_worker(extraction_mode: str = 'profile'):
+    """Create the per-process scraper used for parsing."""
+    global _worker_scraper
+    _worker_scraper = AttorneyScraper(extraction_mode=extraction_mode)
+
+
+def _parse_in_worker(content: bytes, url: str, extraction_mode: str) -> List[Dict]:
+    """Parse a downloaded page inside a parse worker."""
+    if _worker_scraper is None or _worker_scraper.extraction_mode != extraction_mode:
+        _init_parse_worker(extraction_mode)
+    return _worker_scraper.parse(content, url)
+
+
+class ScrapeWorkerPool:
+    """Runs scrapes on worker pools and exposes them as awaitables."""
+
+    def __init__(self, scraper: AttorneyScraper, io_workers: int = 4, parse_workers: int = 2):
+        """
+        Initialize worker pool.
+
+        Args:
+            scraper: Scraper used for downloads (its delay sets per-host spacing)
+            io_workers: Number of threads for network I/O
+            parse_workers: Number of processes for parsing and extraction
+        """
+        self.scraper = scraper
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=io_workers,
+            thread_name_prefix='scrape-io'
+        )
+        self._parse_executor: Optional[Executor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._throttle: Optional[HostThrottle] = None
+
+    async def scrape(self, url: str, raise_errors: bool = False) -> List[Dict]:
+        """
+        Scrape attorney information from a URL without blocking the event loop.
+
+        Args:
+            url: URL to scrape
+            raise_errors: Raise download and parse errors instead of logging
+                them and returning no attorneys, so callers can tell a page
+                that failed to load from one without attorneys
+
+        Returns:
+            List of attorney data dictionaries
+        """
+        loop = asyncio.get_running_loop()
+        slots, throttle = self._loop_state(loop)
+
+        if self.scraper.cache_only:
+            await slots.acquire()
+        else:
+            await throttle.acquire(url, slots)
+        try:
+            fetched = await loop.run_in_executor(self._io_executor, self.scraper.fetch, url)
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error scraping {url}: {str(e)}")
+            return []
+        finally:
+            slots.release()
+
+        # A 304 from a cached page skips the parse entirely
+        if fetched.records is not None:
+            return fetched.records
+
+        try:
+            attorneys = await self._run_parse(loop, fetched.content, url)
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error scraping {url}: {str(e)}")
+            return []
+
+        await loop.run_in_executor(self._io_executor, self.scraper.remember, url, attorneys)
+        return attorneys
+
+    def shutdown(self):
+        """Stop all worker threads and processes."""
+        self._io_executor.shutdown(wait=False)
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=False)
+            self._parse_executor = None
+
+    def _loop_state(self, loop: asyncio.AbstractEventLoop):
+        """Return the semaphore and throttle bound to the running loop."""
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.io_workers)
+            self._throttle = HostThrottle(self.scraper.delay)
+        return self._slots, self._throttle
+
+    async def _run_parse(self, loop: asyncio.AbstractEventLoop, content: bytes, url: str) -> List[Dict]:
+        """Parse on the process pool, falling back to a thread if it is unusable."""
+        executor = self._get_parse_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            try:
+                return await loop.run_in_executor(
+                    executor, _parse_in_worker, content, url, self.scraper.extraction_mode
+                )
+            except BrokenProcessPool:
+                print("Parse worker pool broke, falling back to threads")
+                self._parse_executor = self._io_executor
+                executor = self._io_executor
+
+        return await loop.run_in_executor(executor, self.scraper.parse, content, url)
+
+    def _get_parse_executor(self) -> Executor:
+        """Create the parse executor on first use."""
+        if self._parse_executor is None:
+            if self.parse_workers > 0:
+                try:
+                    self._parse_executor = ProcessPoolExecutor(
+                        max_workers=self.parse_workers,
+                        initializer=_init_parse_worker,
+                        initargs=(self.scraper.extraction_mode,)
+                    )
+                except (OSError, NotImplementedError, ImportError) as e:
+                    # Some serverless runtimes lack the shared memory that
+                    # multiprocessing needs; parse on threads there instead
+                    print(f"Process pool unavailable ({e}), parsing on threads")
+                    self._parse_executor = self._io_executor
+            else:
+                self._parse_executor = self._io_executor
+        return self._parse_executor
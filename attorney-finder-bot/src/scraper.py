@@ -2,30 +2,176 @@
 Web scraper for extracting attorney information from various sources.
 """
 import re
+import asyncio
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
-import phonenumbers
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
+from typing import List, Dict, Optional, Iterable, AsyncIterator, NamedTuple, Tuple
+from urllib.parse import urljoin, urlparse, urldefrag
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+from extraction import (
+    PageIndex,
+    EMAIL_PATTERN,
+    EMAIL_VALID_PATTERN,
+    ZIP_PATTERN,
+    STATE_PATTERN,
+    NAME_SELECTORS,
+    ADDRESS_SELECTORS,
+    PROFILE_PATH_PATTERN,
+    LISTING_PATH_PATTERN,
+    PAGINATION_PATTERN,
+    NEXT_LINK_TEXT_PATTERN
+)
+from http_cache import ResponseCache
+from phone_normalizer import find_phone_numbers, normalize_phone
+from practice_areas import practice_area_matcher
+from roster import ROSTER_MIN_CARDS, find_roster_cards, card_name, is_roster_heading
+from structured_data import (
+    extract_json_ld,
+    parse_json_ld,
+    find_attorney_entities,
+    microdata_item,
+    entity_fields
+)
+
+
+# Fields structured data must supply for the DOM heuristics to be skipped.
+# Website is left out because it always has a cheap fallback.
+COMPLETE_FIELDS = [
+    'name', 'phone', 'email', 'address', 'city', 'state', 'zip_code', 'practice_areas'
+]
+
+ADDRESS_FIELDS = ['address', 'city', 'state', 'zip_code']
+
+EXTRACTION_MODES = ['profile', 'roster', 'auto']
+
+DEFAULT_MAX_PAGE_BYTES = 5 * 1024 * 1024
+HTML_CONTENT_TYPES = ['text/html', 'application/xhtml+xml']
+
+# Markup that never contributes to extraction: stripped before parsing
+UNUSED_MARKUP_PATTERN = re.compile(
+    rb'<(script|style|template)\b[^>]*>.*?</\1\s*>|<!--.*?-->',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Name selectors that mark a page as a single attorney's profile
+PROFILE_NAME_SELECTORS = ['h1.attorney-name', 'h1.profile-name', '.attorney-info h1']
+
+# Bump whenever extraction output changes, so records cached by older
+# extractors are re-extracted instead of reused
+EXTRACTOR_VERSION = 5
+
+
+class FetchResult(NamedTuple):
+    """A downloaded (or cached) page."""
+
+    content: bytes
+    # Records cached for this exact body, if still valid; None means parse
+    records: Optional[List[Dict]]
+    # Whether a request actually went out to the host
+    network: bool
+
+
+class HostThrottle:
+    """
+    Spaces out requests to the same host for the async crawl mode.
+
+    Each host gets its own lock and last-request timestamp, so requests to
+    one host are at least ``delay`` seconds apart while requests to other
+    hosts proceed independently.
+    """
+
+    def __init__(self, delay: float):
+        """
+        Initialize throttle.
+
+        Args:
+            delay: Minimum seconds between two requests to the same host
+        """
+        self.delay = delay
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+
+    async def acquire(self, url: str, slots: asyncio.Semaphore):
+        """
+        Wait for the host of ``url`` to become available, then take a slot.
+
+        The host lock is held until a global slot is acquired and the start
+        time recorded, so queueing for a slot can never squeeze two requests
+        to the same host closer together than ``delay``.
+
+        Args:
+            url: URL about to be requested
+            slots: Semaphore bounding the total number of in-flight requests
+        """
+        host = urlparse(url).netloc.lower()
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+
+        async with lock:
+            last = self._last_request.get(host)
+            if last is not None:
+                wait = last + self.delay - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            await slots.acquire()
+            self._last_request[host] = loop.time()
+
 
 class AttorneyScraper:
     """Scrapes attorney information from web pages."""
 
-    def __init__(self, delay: float = 2.0):
+    def __init__(
+        self,
+        delay: float = 2.0,
+        max_concurrency: int = 8,
+        cache: Optional[ResponseCache] = None,
+        cache_only: bool = False,
+        extraction_mode: str = 'profile',
+        max_page_bytes: int = DEFAULT_MAX_PAGE_BYTES
+    ):
         """
         Initialize scraper.
 
         Args:
             delay: Delay between requests in seconds (be respectful)
+            max_concurrency: Maximum in-flight requests in async crawl mode
+            cache: Response cache used for conditional re-fetching
+            cache_only: Never touch the network; serve pages from the cache
+                and re-extract them (e.g. after improving the extractors)
+            extraction_mode: 'profile' treats every page as one attorney,
+                'roster' returns one record per attorney card on firm roster
+                pages, and 'auto' uses roster extraction only on pages that
+                look like listings
+            max_page_bytes: Pages larger than this are skipped
         """
+        if cache_only and cache is None:
+            raise ValueError("cache_only requires a response cache")
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"extraction_mode must be one of {', '.join(EXTRACTION_MODES)}")
+
         self.delay = delay
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.cache_only = cache_only
+        self.extraction_mode = extraction_mode
+        self.max_page_bytes = max_page_bytes
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
 
+        # Size the connection pool so concurrent crawl workers can reuse
+        # keep-alive connections instead of opening new ones
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency,
+            pool_maxsize=max_concurrency
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def scrape_url(self, url: str) -> List[Dict]:
         """
         Scrape attorney information from a given URL.
@@ -37,19 +183,12 @@ class AttorneyScraper:
             List of attorney data dictionaries
         """
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'lxml')
-            attorneys = []
-
-            # Extract attorney data
-            attorney_data = self._extract_attorney_data(soup, url)
-            if attorney_data:
-                attorneys.append(attorney_data)
+            fetched = self.fetch(url)
+            attorneys = self._extract(fetched, url)
 
             # Respect the server
-            time.sleep(self.delay)
+            if fetched.network:
+                time.sleep(self.delay)
 
             return attorneys
 
@@ -57,23 +196,388 @@ class AttorneyScraper:
             print(f"Error scraping {url}: {str(e)}")
             return []
 
-    def _extract_attorney_data(self, soup: BeautifulSoup, source_url: str) -> Optional[Dict]:
+    async def crawl(
+        self,
+        urls: Iterable[str],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
         """
-        Extract attorney data from BeautifulSoup object.
+        Scrape many URLs concurrently.
+
+        At most ``max_concurrency`` requests are in flight at once, and
+        requests to the same host are spaced ``self.delay`` seconds apart,
+        so throughput scales with the number of distinct hosts while each
+        site sees the same rate as with ``scrape_url``.
+
+        Args:
+            urls: URLs to scrape
+            max_concurrency: Overrides the scraper's in-flight request limit
+
+        Yields:
+            Attorney data dictionaries, in completion order
+        """
+        limit = max_concurrency or self.max_concurrency
+        slots = asyncio.Semaphore(limit)
+        throttle = HostThrottle(self.delay)
+        executor = ThreadPoolExecutor(max_workers=limit)
+        loop = asyncio.get_running_loop()
+
+        async def scrape_one(url: str) -> List[Dict]:
+            if self.cache_only:
+                await slots.acquire()
+            else:
+                await throttle.acquire(url, slots)
+            try:
+                fetched = await loop.run_in_executor(executor, self.fetch, url)
+            except Exception as e:
+                print(f"Error scraping {url}: {str(e)}")
+                return []
+            finally:
+                slots.release()
+
+            try:
+                return await loop.run_in_executor(executor, self._extract, fetched, url)
+            except Exception as e:
+                print(f"Error scraping {url}: {str(e)}")
+                return []
+
+        tasks = [asyncio.ensure_future(scrape_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for attorney_data in await next_done:
+                    yield attorney_data
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False)
+
+    def fetch(self, url: str) -> FetchResult:
+        """
+        Download a page, revalidating against the response cache if enabled.
+
+        A cached page is requested with If-None-Match / If-Modified-Since;
+        on 304 the cached body (and its cached records) are reused. Bodies
+        are streamed and rejected once they exceed max_page_bytes, and
+        non-HTML responses are rejected before their body is read.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            FetchResult with the page body and any reusable records
+        """
+        entry = self.cache.get(url) if self.cache else None
+
+        if self.cache_only:
+            if entry is None:
+                raise LookupError(f"{url} is not in the response cache")
+            return FetchResult(entry['body'], self._cached_records(entry), False)
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, timeout=10, headers=headers, stream=True)
+        try:
+            if entry and response.status_code == 304:
+                return FetchResult(entry['body'], self._cached_records(entry), True)
+
+            response.raise_for_status()
+            content = self._read_body(response, url)
+        finally:
+            response.close()
+
+        if self.cache:
+            self.cache.store(
+                url,
+                content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return FetchResult(content, None, True)
+
+    def _read_body(self, response: requests.Response, url: str) -> bytes:
+        """
+        Read a streamed HTML response body, enforcing the size cap.
+
+        Args:
+            response: Streamed response
+            url: URL being fetched (for error messages)
+
+        Returns:
+            Response body
+
+        Raises:
+            ValueError: If the response is not HTML or is larger than
+                max_page_bytes
+        """
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise ValueError(f"unsupported content type {content_type}")
+
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_page_bytes:
+            raise ValueError(f"page is {declared} bytes, over the {self.max_page_bytes} byte limit")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_page_bytes:
+                raise ValueError(f"page is over the {self.max_page_bytes} byte limit")
+            chunks.append(chunk)
+
+        return b''.join(chunks)
+
+    def _extract(self, fetched: FetchResult, url: str) -> List[Dict]:
+        """Return cached records for a page, or parse it and cache the result."""
+        if fetched.records is not None:
+            return fetched.records
+
+        attorneys = self.parse(fetched.content, url)
+        self.remember(url, attorneys)
+        return attorneys
+
+    def remember(self, url: str, attorneys: List[Dict]):
+        """
+        Cache the records extracted from a page's current body.
+
+        Callers that parse a fetched page themselves (rather than through
+        scrape_url) call this so the next 304 can reuse the records.
+
+        Args:
+            url: URL the page was fetched from
+            attorneys: Records parsed from its body
+        """
+        if self.cache:
+            self.cache.store_records(url, attorneys, EXTRACTOR_VERSION, self.extraction_mode)
+
+    def _cached_records(self, entry: Dict) -> Optional[List[Dict]]:
+        """Cached records, if the current extractors produced them in this scraper's mode."""
+        if (entry['records'] is not None
+                and entry['extractor_version'] == EXTRACTOR_VERSION
+                and entry['extraction_mode'] == self.extraction_mode):
+            return entry['records']
+        return None
+
+    def parse(self, content: bytes, url: str) -> List[Dict]:
+        """
+        Parse a downloaded page into attorney records.
+
+        Args:
+            content: Raw HTML
+            url: URL the page was fetched from
+
+        Returns:
+            List of attorney data dictionaries
+        """
+        # Fast path: complete JSON-LD needs no DOM at all
+        entities = find_attorney_entities(extract_json_ld(content))
+        roster = self._structured_roster(entities, url)
+        if roster:
+            return roster
+        if entities:
+            structured = self._structured_record(entities, url)
+            if self._is_complete(structured):
+                return [structured]
+
+        soup = self._build_tree(content)
+        try:
+            return self._extract_records(soup, PageIndex(soup), url, entities)
+        finally:
+            # Break the tree's parent/child cycles now rather than whenever
+            # the garbage collector gets to them
+            soup.decompose()
+
+    def parse_with_links(self, content: bytes, url: str) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """
+        Parse a page into attorney records and the crawlable links it contains.
+
+        Used by directory crawls; the page is parsed and indexed once for
+        both extraction and link discovery.
+
+        Args:
+            content: Raw HTML
+            url: URL the page was fetched from
+
+        Returns:
+            Tuple of (attorney data dictionaries, list of (link, kind)) where
+            kind is 'profile' or 'listing'
+        """
+        entities = find_attorney_entities(extract_json_ld(content))
+        soup = self._build_tree(content)
+        try:
+            page = PageIndex(soup)
+            return self._extract_records(soup, page, url, entities), self._discover_links(page, url)
+        finally:
+            soup.decompose()
+
+    def discover_links(self, content: bytes, url: str) -> List[Tuple[str, str]]:
+        """
+        Find the crawlable links on a page without extracting attorneys.
+
+        Used by directory crawls for pages whose records came from the
+        response cache.
+
+        Args:
+            content: Raw HTML
+            url: URL the page was fetched from
+
+        Returns:
+            List of (link, kind) where kind is 'profile' or 'listing'
+        """
+        soup = self._build_tree(content)
+        try:
+            return self._discover_links(PageIndex(soup), url)
+        finally:
+            soup.decompose()
+
+    def _build_tree(self, content: bytes) -> BeautifulSoup:
+        """
+        Parse only the parts of a page the extractors use.
+
+        Scripts, stylesheets, templates and comments never contribute to
+        extracted text (JSON-LD is read from the raw HTML beforehand), so
+        they are cut from the markup before lxml builds the tree. On
+        script-heavy pages this is most of the document.
+
+        Args:
+            content: Raw HTML
+
+        Returns:
+            BeautifulSoup parsed HTML
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return BeautifulSoup(UNUSED_MARKUP_PATTERN.sub(b'', content), 'lxml')
+
+    def _extract_records(
+        self,
+        soup: BeautifulSoup,
+        page: PageIndex,
+        url: str,
+        json_ld_entities: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Extract every attorney on a parsed page according to extraction_mode.
 
         Args:
             soup: BeautifulSoup parsed HTML
+            page: Index of ``soup``
+            url: URL the page was fetched from
+            json_ld_entities: Attorney entities already decoded from the raw HTML
+
+        Returns:
+            List of attorney data dictionaries
+        """
+        if self.extraction_mode != 'profile':
+            if json_ld_entities is None:
+                json_ld_entities = self._page_json_ld(page)
+            roster = self._structured_roster(json_ld_entities, url)
+            if roster:
+                return roster
+
+            roster = self._extract_roster(soup, page, url)
+            if roster:
+                return roster
+
+        attorney_data = self._extract_attorney_data(soup, url, json_ld_entities=json_ld_entities, page=page)
+        return [attorney_data] if attorney_data else []
+
+    def _structured_roster(self, entities: List[Dict], source_url: str) -> List[Dict]:
+        """
+        One record per attorney when structured data lists several people.
+
+        Args:
+            entities: JSON-LD attorney entities
             source_url: Original URL
 
         Returns:
-            Dictionary with attorney data or None
+            Attorney records, or an empty list if the data describes at most
+            one attorney (or roster extraction is off)
+        """
+        if self.extraction_mode == 'profile':
+            return []
+
+        # Organisations are context for their attorneys, not roster entries
+        people = [
+            entity for entity in entities
+            if 'LegalService' not in str(entity.get('@type')) and entity_fields(entity)['name']
+        ]
+        if len({entity_fields(entity)['name'] for entity in people}) < 2:
+            return []
+
+        records = []
+        for entity in people:
+            data = self._structured_record([entity], source_url)
+            data['website'] = data['website'] or self._site_url(source_url)
+            records.append(data)
+        return records
+
+    def _extract_roster(self, soup: BeautifulSoup, page: PageIndex, source_url: str) -> List[Dict]:
+        """
+        Extract one record per attorney card on a firm roster page.
+
+        Args:
+            soup: BeautifulSoup parsed HTML
+            page: Index of ``soup``
+            source_url: Original URL
+
+        Returns:
+            Attorney records, or an empty list if the page is not a roster
+        """
+        if self.extraction_mode == 'auto' and not self._looks_like_listing(page, source_url):
+            return []
+
+        cards = find_roster_cards(soup)
+        if not cards:
+            return []
+
+        records = []
+        seen = set()
+        for card in cards:
+            data = self._extract_card(card, source_url)
+            if data is None:
+                continue
+            key = (data['name'], data['source_url'])
+            if key not in seen:
+                seen.add(key)
+                records.append(data)
+
+        return records if len(records) >= ROSTER_MIN_CARDS else []
+
+    def _extract_card(self, card: Tag, source_url: str) -> Optional[Dict]:
         """
+        Extract one attorney from a roster card.
+
+        The card's profile link, if any, becomes its source_url so the record
+        lines up with a later fetch of the full profile.
+
+        Args:
+            card: Card element
+            source_url: URL of the roster page
+
+        Returns:
+            Attorney data dictionary or None
+        """
+        page = PageIndex(card)
+        card_text = card.get_text(' ')
+
+        profile_url = source_url
+        for link in page.links:
+            if PROFILE_PATH_PATTERN.search(link['href']):
+                profile_url = urldefrag(urljoin(source_url, link['href']))[0]
+                break
+
         data = {
-            'source_url': source_url,
-            'name': None,
+            'source_url': profile_url,
+            'name': card_name(card),
             'phone': None,
-            'email': None,
-            'website': None,
+            'email': self._extract_email(page),
+            'website': self._site_url(source_url),
             'address': None,
             'city': None,
             'state': None,
@@ -81,52 +585,231 @@ class AttorneyScraper:
             'practice_areas': None
         }
 
+        phones = self._extract_phone_numbers(page)
+        if phones:
+            data['phone'] = ', '.join(phones)
+
+        if page.postal_address is not None or page.address_elements:
+            data.update(self._extract_address(page))
+
+        practice_areas = practice_area_matcher.find_all(card_text)
+        if practice_areas:
+            data['practice_areas'] = ', '.join(practice_areas)
+
+        return data if data['name'] or data['phone'] else None
+
+    def _looks_like_listing(self, page: PageIndex, source_url: str) -> bool:
+        """Whether a page announces a list of attorneys rather than one profile."""
+        if any(selector in page.name_elements for selector in PROFILE_NAME_SELECTORS):
+            return False
+        if page.microdata_element is not None:
+            return False
+
+        path = urlparse(source_url).path
+        if LISTING_PATH_PATTERN.search(path) or PAGINATION_PATTERN.search(source_url):
+            return True
+
+        heading = page.name_elements.get('h1')
+        return heading is not None and is_roster_heading(heading.get_text(' ', strip=True))
+
+    def _page_json_ld(self, page: PageIndex) -> List[Dict]:
+        """Attorney entities from the JSON-LD script tags in an indexed page."""
+        documents = [parse_json_ld(script.get_text()) for script in page.json_ld_scripts]
+        return find_attorney_entities([d for d in documents if d is not None])
+
+    def _site_url(self, source_url: str) -> str:
+        """Scheme and host of a URL, used as the fallback website."""
+        parsed = urlparse(source_url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _discover_links(self, page: PageIndex, source_url: str) -> List[Tuple[str, str]]:
+        """
+        Find same-site profile and listing links on a page.
+
+        Args:
+            page: Indexed page
+            source_url: URL the page was fetched from
+
+        Returns:
+            Unique (absolute URL, kind) pairs, kind being 'profile' or 'listing'
+        """
+        site = urlparse(source_url).netloc.lower()
+        if site.startswith('www.'):
+            site = site[4:]
+
+        links = {}
+        for link in page.links:
+            href = link['href'].strip()
+            if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+                continue
+
+            full_url = urldefrag(urljoin(source_url, href))[0]
+            parsed = urlparse(full_url)
+            host = parsed.netloc.lower()
+            if host.startswith('www.'):
+                host = host[4:]
+            if parsed.scheme not in ('http', 'https') or host != site:
+                continue
+
+            rel = link.get('rel') or []
+            if PROFILE_PATH_PATTERN.search(parsed.path):
+                links.setdefault(full_url, 'profile')
+            elif ('next' in rel or LISTING_PATH_PATTERN.search(parsed.path)
+                    or PAGINATION_PATTERN.search(full_url)
+                    or NEXT_LINK_TEXT_PATTERN.match(link.get_text(strip=True))):
+                links.setdefault(full_url, 'listing')
+
+        links.pop(urldefrag(source_url)[0], None)
+        return list(links.items())
+
+    def _extract_attorney_data(
+        self,
+        soup: BeautifulSoup,
+        source_url: str,
+        json_ld_entities: Optional[List[Dict]] = None,
+        page: Optional[PageIndex] = None
+    ) -> Optional[Dict]:
+        """
+        Extract attorney data from BeautifulSoup object.
+
+        The tree is walked once into a PageIndex, and every field extractor
+        reads from that shared index instead of re-scanning the document.
+        Embedded JSON-LD and microdata are read first; fields they supply
+        take priority, and the heuristic extractors only run for the rest.
+
+        Args:
+            soup: BeautifulSoup parsed HTML
+            source_url: Original URL
+            json_ld_entities: Attorney entities already decoded from the raw
+                HTML, if the caller has them
+            page: Index of ``soup``, if the caller already built one
+
+        Returns:
+            Dictionary with attorney data or None
+        """
+        if page is None:
+            page = PageIndex(soup)
+
+        # Structured data, in priority order: JSON-LD then microdata
+        if json_ld_entities is None:
+            json_ld_entities = self._page_json_ld(page)
+        entities = list(json_ld_entities)
+        if page.microdata_element is not None:
+            entities.append(microdata_item(page.microdata_element))
+
+        data = self._structured_record(entities, source_url)
+        if self._is_complete(data):
+            return data
+
         # Extract name
-        name = self._extract_name(soup)
-        if name:
-            data['name'] = name
+        if not data['name']:
+            data['name'] = self._extract_name(page)
 
         # Extract phone numbers
-        phones = self._extract_phone_numbers(soup)
-        if phones:
-            data['phone'] = ', '.join(phones)
+        if not data['phone']:
+            phones = self._extract_phone_numbers(page)
+            if phones:
+                data['phone'] = ', '.join(phones)
 
         # Extract email
-        email = self._extract_email(soup)
-        if email:
-            data['email'] = email
+        if not data['email']:
+            data['email'] = self._extract_email(page)
 
         # Extract address components
-        address_data = self._extract_address(soup)
-        data.update(address_data)
+        if not all(data[field] for field in ADDRESS_FIELDS):
+            address_data = self._extract_address(page)
+            for field in ADDRESS_FIELDS:
+                if not data[field]:
+                    data[field] = address_data[field]
 
         # Extract practice areas
-        practice_areas = self._extract_practice_areas(soup)
-        if practice_areas:
-            data['practice_areas'] = ', '.join(practice_areas)
+        if not data['practice_areas']:
+            practice_areas = self._extract_practice_areas(page)
+            if practice_areas:
+                data['practice_areas'] = ', '.join(practice_areas)
 
         # Extract website
-        website = self._extract_website(soup, source_url)
-        if website:
-            data['website'] = website
+        if not data['website']:
+            data['website'] = self._extract_website(page, source_url)
 
         return data if data['name'] or data['phone'] else None
 
-    def _extract_name(self, soup: BeautifulSoup) -> Optional[str]:
+    def _structured_record(self, entities: List[Dict], source_url: str) -> Dict:
+        """
+        Build an attorney record from schema.org entities.
+
+        Entities are merged field by field in the order given, so earlier
+        (higher priority) entities win.
+
+        Args:
+            entities: JSON-LD or microdata entities, highest priority first
+            source_url: Original URL
+
+        Returns:
+            Attorney data dictionary; fields not found are None
+        """
+        data = {
+            'source_url': source_url,
+            'name': None,
+            'phone': None,
+            'email': None,
+            'website': None,
+            'address': None,
+            'city': None,
+            'state': None,
+            'zip_code': None,
+            'practice_areas': None
+        }
+
+        for entity in entities:
+            fields = entity_fields(entity)
+
+            if not data['name'] and fields['name'] and len(fields['name']) < 100:
+                data['name'] = fields['name']
+
+            if not data['phone']:
+                phones = []
+                for raw in fields['telephones']:
+                    formatted = normalize_phone(raw)
+                    if formatted and formatted not in phones:
+                        phones.append(formatted)
+                if phones:
+                    data['phone'] = ', '.join(phones[:5])
+
+            if not data['email']:
+                data['email'] = next(
+                    (email for email in fields['emails'] if self._is_valid_email(email)),
+                    None
+                )
+
+            if not data['website'] and fields['url']:
+                data['website'] = urljoin(source_url, fields['url'])
+
+            for field in ADDRESS_FIELDS:
+                if not data[field] and fields[field]:
+                    data[field] = fields[field]
+
+            if not data['practice_areas'] and fields['practice_text']:
+                practice_areas = practice_area_matcher.find_all(fields['practice_text'])
+                if practice_areas:
+                    data['practice_areas'] = ', '.join(practice_areas)
+
+        return data
+
+    def _is_complete(self, data: Dict) -> bool:
+        """Whether a structured record has every field in COMPLETE_FIELDS."""
+        if not all(data[field] for field in COMPLETE_FIELDS):
+            return False
+
+        if not data['website']:
+            data['website'] = self._site_url(data['source_url'])
+        return True
+
+    def _extract_name(self, page: PageIndex) -> Optional[str]:
         """Extract attorney name from page."""
         # Try common selectors for attorney names
-        selectors = [
-            'h1.attorney-name',
-            'h1.profile-name',
-            '.attorney-info h1',
-            'h1',
-            '.profile-header h1',
-            '[itemprop="name"]',
-            '.lawyer-name'
-        ]
-
-        for selector in selectors:
-            elem = soup.select_one(selector)
+        for selector in NAME_SELECTORS:
+            elem = page.name_elements.get(selector)
             if elem and elem.get_text(strip=True):
                 name = elem.get_text(strip=True)
                 # Basic validation - name shouldn't be too long
@@ -135,52 +818,20 @@ class AttorneyScraper:
 
         return None
 
-    def _extract_phone_numbers(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_phone_numbers(self, page: PageIndex) -> List[str]:
         """Extract and validate phone numbers from page."""
-        phones = set()
-
-        # Get all text content
-        text_content = soup.get_text()
+        return find_phone_numbers(page.text, limit=5)  # Limit to first 5 unique numbers
 
-        # Find all phone number patterns
-        phone_patterns = [
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890 or variations
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',        # 123-456-7890 or variations
-            r'\+1[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # +1-123-456-7890
-        ]
-
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text_content)
-            for match in matches:
-                try:
-                    # Parse and validate phone number
-                    parsed = phonenumbers.parse(match, "US")
-                    if phonenumbers.is_valid_number(parsed):
-                        formatted = phonenumbers.format_number(
-                            parsed,
-                            phonenumbers.PhoneNumberFormat.NATIONAL
-                        )
-                        phones.add(formatted)
-                except:
-                    continue
-
-        return list(phones)[:5]  # Limit to first 5 unique numbers
-
-    def _extract_email(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_email(self, page: PageIndex) -> Optional[str]:
         """Extract email address from page."""
         # Find mailto links
-        mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-        if mailto_links:
-            email = mailto_links[0]['href'].replace('mailto:', '').strip()
+        if page.first_mailto is not None:
+            email = page.first_mailto['href'].replace('mailto:', '').strip()
             if self._is_valid_email(email):
                 return email
 
         # Find email patterns in text
-        text_content = soup.get_text()
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text_content)
-
-        for email in matches:
+        for email in EMAIL_PATTERN.findall(page.text):
             if self._is_valid_email(email):
                 return email
 
@@ -193,10 +844,9 @@ class AttorneyScraper:
         if any(domain in email.lower() for domain in invalid_domains):
             return False
 
-        pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_VALID_PATTERN.match(email))
 
-    def _extract_address(self, soup: BeautifulSoup) -> Dict:
+    def _extract_address(self, page: PageIndex) -> Dict:
         """Extract address components from page."""
         data = {
             'address': None,
@@ -206,7 +856,7 @@ class AttorneyScraper:
         }
 
         # Try schema.org markup first
-        address_elem = soup.find(attrs={"itemtype": re.compile(r"PostalAddress")})
+        address_elem = page.postal_address
         if address_elem:
             street = address_elem.find(attrs={"itemprop": "streetAddress"})
             city = address_elem.find(attrs={"itemprop": "addressLocality"})
@@ -225,15 +875,8 @@ class AttorneyScraper:
             return data
 
         # Look for address in common class names
-        address_selectors = [
-            '.address',
-            '.location',
-            '.contact-info',
-            '[itemprop="address"]'
-        ]
-
-        for selector in address_selectors:
-            elem = soup.select_one(selector)
+        for selector in ADDRESS_SELECTORS:
+            elem = page.address_elements.get(selector)
             if elem:
                 address_text = elem.get_text(strip=True)
                 # Try to parse address components
@@ -246,11 +889,11 @@ class AttorneyScraper:
     def _parse_address_text(self, text: str) -> Optional[Dict]:
         """Parse address text into components."""
         # Look for ZIP code
-        zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', text)
+        zip_match = ZIP_PATTERN.search(text)
         zip_code = zip_match.group() if zip_match else None
 
         # Look for state (2-letter code)
-        state_match = re.search(r'\b([A-Z]{2})\b', text)
+        state_match = STATE_PATTERN.search(text)
         state = state_match.group(1) if state_match else None
 
         # City is typically before state
@@ -267,52 +910,32 @@ class AttorneyScraper:
             'zip_code': zip_code
         }
 
-    def _extract_practice_areas(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_practice_areas(self, page: PageIndex) -> List[str]:
         """Extract practice areas from page."""
-        practice_areas = set()
-
-        # Common practice area keywords
-        keywords = [
-            'criminal', 'family', 'divorce', 'personal injury', 'dui', 'dwi',
-            'immigration', 'bankruptcy', 'estate planning', 'real estate',
-            'business', 'corporate', 'employment', 'civil', 'litigation',
-            'medical malpractice', 'workers compensation', 'tax', 'intellectual property'
-        ]
+        practice_areas = []
 
-        # Look in specific sections
-        practice_selectors = [
-            '.practice-areas',
-            '.areas-of-practice',
-            '.specialties',
-            '[class*="practice"]'
-        ]
+        # Look in practice-area sections collected by the page index, then
+        # in the meta description. Separate strings so adjacent list items
+        # ("Personal Injury", "Tax") don't run together across word boundaries.
+        texts = [elem.get_text(' ') for elem in page.practice_elements]
+        if page.meta_description:
+            texts.append(page.meta_description)
+
+        for text in texts:
+            for area in practice_area_matcher.find_all(text):
+                if area not in practice_areas:
+                    practice_areas.append(area)
+
+        return practice_areas
 
-        for selector in practice_selectors:
-            elems = soup.select(selector)
-            for elem in elems:
-                text = elem.get_text().lower()
-                for keyword in keywords:
-                    if keyword in text:
-                        practice_areas.add(keyword.title())
-
-        # Also check meta description and page title
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            text = meta_desc['content'].lower()
-            for keyword in keywords:
-                if keyword in text:
-                    practice_areas.add(keyword.title())
-
-        return list(practice_areas)
-
-    def _extract_website(self, soup: BeautifulSoup, source_url: str) -> Optional[str]:
+    def _extract_website(self, page: PageIndex, source_url: str) -> Optional[str]:
         """Extract website URL."""
         # Parse the source URL
         parsed = urlparse(source_url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
 
         # Look for website links
-        for link in soup.find_all('a', href=True):
+        for link in page.links:
             href = link['href']
             text = link.get_text(strip=True).lower()
 
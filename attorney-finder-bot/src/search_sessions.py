@@ -0,0 +1,126 @@
+"""
+Persistent state of the searches whose Prev/Next buttons still work.
+
+A search's buttons carry only its id; the parameters, the result IDs
+loaded so far and the cursor to continue from live in SQLite next to the
+attorneys table. Any process serving the bot (a webhook instance other
+than the one that ran the search, or one that just started) can then turn
+the page. A session is never invalidated by writes, so its pages stay
+stable while the user flips through them.
+"""
+import json
+import time
+import sqlite3
+from typing import Dict, Optional
+
+
+DEFAULT_TTL_SECONDS = 3600.0
+
+
+class SearchSessionStore:
+    """SQLite-backed search sessions that expire after a period without use."""
+
+    def __init__(self, db_path: str = "attorneys.db", ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize store and create its table if needed.
+
+        Args:
+            db_path: Path to the SQLite database (normally the attorneys database)
+            ttl_seconds: Seconds a session is kept after it was last saved
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.init_store()
+
+    def init_store(self):
+        """Create the session table if it doesn't exist."""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_sessions (
+                id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                ids TEXT NOT NULL,
+                distances TEXT NOT NULL,
+                cursor TEXT,
+                done INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_search_sessions_expires ON search_sessions(expires_at)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def save(self, search_id: str, session: Dict):
+        """
+        Store a session and restart its time to live.
+
+        Expired sessions are deleted at the same time.
+
+        Args:
+            search_id: Id carried by the search's buttons
+            session: Dictionary with params, ids, distances, cursor and done
+        """
+        now = time.time()
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute("DELETE FROM search_sessions WHERE expires_at < ?", (now,))
+        cursor.execute('''
+            INSERT OR REPLACE INTO search_sessions (id, params, ids, distances, cursor, done, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            search_id,
+            json.dumps(session['params']),
+            json.dumps(session['ids']),
+            # JSON object keys are strings; pairs keep the ids integers
+            json.dumps(list(session['distances'].items())),
+            session['cursor'],
+            int(session['done']),
+            now + self.ttl_seconds
+        ))
+
+        conn.commit()
+        conn.close()
+
+    def get(self, search_id: str) -> Optional[Dict]:
+        """
+        Look up a session.
+
+        Args:
+            search_id: Id carried by the search's buttons
+
+        Returns:
+            Dictionary with params, ids, distances, cursor and done, or
+            None if the session is unknown or has expired
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT params, ids, distances, cursor, done FROM search_sessions
+            WHERE id = ? AND expires_at >= ?
+        ''', (search_id, time.time()))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+
+        return {
+            'params': json.loads(row['params']),
+            'ids': json.loads(row['ids']),
+            'distances': {attorney_id: distance for attorney_id, distance in json.loads(row['distances'])},
+            'cursor': row['cursor'],
+            'done': bool(row['done'])
+        }
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a connection that waits out other writers instead of failing."""
+        return sqlite3.connect(self.db_path, timeout=30, **kwargs)
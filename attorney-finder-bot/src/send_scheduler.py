@@ -0,0 +1,344 @@
+"""
+Outbound Bot API scheduler that keeps the bot under Telegram's flood limits.
+
+Every request the bot makes goes through SendScheduler (it is installed as
+the Application's rate limiter). Requests addressed to a chat wait for a
+token from that chat's bucket and from the global bucket, so bursts are
+spread out instead of earning 429s:
+
+- Telegram allows about 30 messages per second overall, about one per
+  second in a private chat and 20 per minute in a group.
+- Interactive replies go before bulk notifications. Pass
+  rate_limit_args=PRIORITY_BULK to a send to mark it as bulk.
+- An edit of a message that is still waiting replaces the waiting edit,
+  so a burst of progress edits costs one request.
+- RetryAfter errors pause the chat for the time Telegram asks and retry.
+
+Requests without a chat (answering callback queries, getMe) are sent
+right away.
+"""
+import asyncio
+import itertools
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+
+# Priorities, lower first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# Sustained rates (requests per second) and bursts
+GLOBAL_RATE = 30.0
+PRIVATE_CHAT_RATE = 1.0
+GROUP_CHAT_RATE = 20 / 60
+CHAT_BURST = 3
+
+# Edits of the same message that may replace each other while waiting
+COALESCED_ENDPOINTS = {'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup'}
+
+# Chat buckets kept before idle ones are dropped
+MAX_CHAT_BUCKETS = 10000
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (the burst size)
+            now: Current loop time
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        """Spend one token."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled completely."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class _SendJob:
+    """A request waiting to be sent, and the callers waiting for its result."""
+
+    def __init__(self, priority: int, seq: int, chat_id: Any, key: Optional[Tuple],
+                 callback: Callable, args: Any, kwargs: Dict):
+        self.priority = priority
+        self.seq = seq
+        self.chat_id = chat_id
+        self.key = key
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.waiters: List[asyncio.Future] = []
+        self.retries = 0
+
+
+class SendScheduler(BaseRateLimiter[int]):
+    """Rate limiter scheduling Bot API requests by chat, priority and global budget."""
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        private_chat_rate: float = PRIVATE_CHAT_RATE,
+        group_chat_rate: float = GROUP_CHAT_RATE,
+        chat_burst: int = CHAT_BURST,
+        max_retries: int = 3
+    ):
+        """
+        Initialize scheduler; its dispatcher starts with the first request.
+
+        Args:
+            global_rate: Requests per second across all chats
+            private_chat_rate: Requests per second to one private chat
+            group_chat_rate: Requests per second to one group chat
+            chat_burst: Requests a chat may receive back to back
+            max_retries: RetryAfter errors tolerated per request before
+                the error is raised to the caller
+        """
+        self.global_rate = global_rate
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+
+        self._jobs: List[_SendJob] = []
+        self._coalescing: Dict[Tuple, _SendJob] = {}
+        self._chat_buckets: Dict[Any, TokenBucket] = {}
+        self._paused_until: Dict[Any, float] = {}
+        self._in_flight: set = set()
+        self._seq = itertools.count()
+        self._global: Optional[TokenBucket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def initialize(self):
+        """Nothing to set up; the dispatcher starts on the first request."""
+
+    async def shutdown(self):
+        """Stop the dispatcher and fail requests that were never sent."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for job in self._jobs:
+            _settle(job, error=RuntimeError("Send scheduler shut down"))
+        self._jobs.clear()
+        self._coalescing.clear()
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int]
+    ) -> Any:
+        """
+        Send a request once its chat and the global budget allow it.
+
+        Args:
+            callback: Coroutine function making the request
+            args: Positional arguments for callback
+            kwargs: Keyword arguments for callback
+            endpoint: Bot API method, e.g. "sendMessage"
+            data: Parameters of the request
+            rate_limit_args: Priority (PRIORITY_INTERACTIVE if None)
+
+        Returns:
+            Result of the request; coalesced edits share the result of the
+            edit that was sent
+        """
+        chat_id = data.get('chat_id')
+        if chat_id is None:
+            return await self._send_unscheduled(callback, args, kwargs)
+
+        loop = asyncio.get_running_loop()
+        self._start_dispatcher(loop)
+        priority = PRIORITY_INTERACTIVE if rate_limit_args is None else rate_limit_args
+        waiter = loop.create_future()
+
+        key = None
+        if endpoint in COALESCED_ENDPOINTS and data.get('message_id') is not None:
+            key = (endpoint, chat_id, data['message_id'])
+
+        job = self._coalescing.get(key) if key else None
+        if job is not None:
+            # The waiting edit is outdated: send this one in its place
+            job.callback, job.args, job.kwargs = callback, args, kwargs
+            job.priority = min(job.priority, priority)
+        else:
+            job = _SendJob(priority, next(self._seq), chat_id, key, callback, args, kwargs)
+            self._jobs.append(job)
+            if key:
+                self._coalescing[key] = job
+
+        job.waiters.append(waiter)
+        self._wakeup.set()
+        return await waiter
+
+    def _start_dispatcher(self, loop: asyncio.AbstractEventLoop):
+        """Start the dispatcher task on the running loop if it isn't running there."""
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._global = TokenBucket(self.global_rate, self.global_rate, loop.time())
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Send waiting jobs as their buckets allow, best priority first."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            delay = None
+
+            if self._jobs:
+                now = loop.time()
+                delay = self._global.wait_time(now)
+                if delay == 0:
+                    job, delay = self._next_ready(now)
+                    if job is not None:
+                        self._start(job, now)
+                        continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _next_ready(self, now: float) -> Tuple[Optional[_SendJob], Optional[float]]:
+        """
+        Best job whose chat can receive a request now.
+
+        Returns:
+            Tuple of (job or None, seconds until some job is ready or None
+            if every waiting chat already has a request in flight)
+        """
+        soonest = None
+        for job in sorted(self._jobs, key=lambda job: (job.priority, job.seq)):
+            # One request per chat at a time keeps a chat's messages in order
+            if job.chat_id in self._in_flight:
+                continue
+            wait = max(
+                self._chat_bucket(job.chat_id, now).wait_time(now),
+                self._paused_until.get(job.chat_id, now) - now
+            )
+            if wait <= 0:
+                return job, None
+            soonest = wait if soonest is None else min(soonest, wait)
+        return None, soonest
+
+    def _start(self, job: _SendJob, now: float):
+        """Spend the job's tokens and send it."""
+        self._jobs.remove(job)
+        if job.key and self._coalescing.get(job.key) is job:
+            del self._coalescing[job.key]
+        self._global.take(now)
+        self._chat_bucket(job.chat_id, now).take(now)
+        self._paused_until.pop(job.chat_id, None)
+        self._in_flight.add(job.chat_id)
+        self._loop.create_task(self._send(job))
+
+    async def _send(self, job: _SendJob):
+        """Make a job's request and hand the result to its callers."""
+        try:
+            result = await job.callback(*job.args, **job.kwargs)
+        except RetryAfter as e:
+            if job.retries >= self.max_retries:
+                _settle(job, error=e)
+            else:
+                self._retry_later(job, _seconds(e.retry_after))
+        except Exception as e:
+            _settle(job, error=e)
+        else:
+            _settle(job, result=result)
+        finally:
+            self._in_flight.discard(job.chat_id)
+            self._wakeup.set()
+
+    def _retry_later(self, job: _SendJob, seconds: float):
+        """Pause the job's chat for Telegram's retry_after and queue the job again."""
+        print(f"Flood limit for chat {job.chat_id}, retrying in {seconds:.0f}s")
+        job.retries += 1
+        self._paused_until[job.chat_id] = self._loop.time() + seconds
+
+        newer = self._coalescing.get(job.key) if job.key else None
+        if newer is not None:
+            # A newer edit of the same message is waiting; it answers both
+            newer.waiters.extend(job.waiters)
+            return
+
+        self._jobs.append(job)
+        if job.key:
+            self._coalescing[job.key] = job
+
+    def _chat_bucket(self, chat_id: Any, now: float) -> TokenBucket:
+        """Return the token bucket of a chat, creating it on first use."""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    chat: bucket for chat, bucket in self._chat_buckets.items()
+                    if not bucket.is_full(now)
+                }
+            # Group and channel chat ids are negative
+            rate = self.group_chat_rate if _is_group(chat_id) else self.private_chat_rate
+            bucket = TokenBucket(rate, self.chat_burst, now)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def _send_unscheduled(self, callback: Callable, args: Any, kwargs: Dict) -> Any:
+        """Send a request that isn't addressed to a chat, honoring RetryAfter."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(_seconds(e.retry_after))
+
+
+def _settle(job: _SendJob, result: Any = None, error: Optional[BaseException] = None):
+    """Resolve every caller still waiting for a job."""
+    for waiter in job.waiters:
+        if waiter.done():
+            continue
+        if error is not None:
+            waiter.set_exception(error)
+        else:
+            waiter.set_result(result)
+
+
+def _seconds(retry_after: Any) -> float:
+    """retry_after in seconds (an int, or a timedelta in newer releases)."""
+    return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+
+
+def _is_group(chat_id: Any) -> bool:
+    """Whether a chat id (or @channelusername) is a group or channel."""
+    if isinstance(chat_id, str):
+        return chat_id.startswith('@') or chat_id.startswith('-')
+    return chat_id < 0
@@ -0,0 +1,244 @@
+"""
+Schema.org structured data (JSON-LD and microdata) for attorney pages.
+
+Many profile pages embed an Attorney, LegalService or Person entity that
+already carries the fields the DOM heuristics try to guess. Reading it is
+both cheaper and more accurate than the selector and regex cascade.
+"""
+import re
+import json
+from typing import List, Dict, Optional, Union
+from bs4 import Tag
+
+
+# Entity types we read, in priority order when a page has several
+ATTORNEY_TYPES = ['Attorney', 'Person', 'LegalService']
+
+JSON_LD_PATTERN = re.compile(
+    rb'<script[^>]*type\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+MICRODATA_TYPE_PATTERN = re.compile(r'schema\.org/(Attorney|LegalService|Person)\b')
+
+
+def extract_json_ld(content: Union[bytes, str]) -> List[Dict]:
+    """
+    Find and decode JSON-LD blocks straight from raw HTML.
+
+    This runs before any DOM is built, so pages whose structured data is
+    complete never need a BeautifulSoup parse.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        List of decoded JSON-LD documents
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    documents = []
+    for block in JSON_LD_PATTERN.findall(content):
+        document = parse_json_ld(block.decode('utf-8', errors='replace'))
+        if document is not None:
+            documents.append(document)
+    return documents
+
+
+def parse_json_ld(text: str) -> Optional[Union[Dict, List]]:
+    """Decode one JSON-LD block, tolerating HTML comment and CDATA wrappers."""
+    text = text.strip()
+    for prefix, suffix in (('<!--', '-->'), ('<![CDATA[', ']]>'), ('//<![CDATA[', '//]]>')):
+        if text.startswith(prefix) and text.endswith(suffix):
+            text = text[len(prefix):-len(suffix)].strip()
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def find_attorney_entities(documents: List) -> List[Dict]:
+    """
+    Flatten JSON-LD documents and return attorney entities by priority.
+
+    Args:
+        documents: Decoded JSON-LD documents
+
+    Returns:
+        Attorney, Person and LegalService entities, highest priority first
+    """
+    entities = []
+    stack = list(documents)
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            # Containers: @graph documents and ItemList/ListItem rosters
+            for key in ('@graph', 'itemListElement', 'item'):
+                if key in node:
+                    stack.append(node[key])
+            if _entity_rank(node) is not None:
+                entities.append(node)
+
+    entities.sort(key=_entity_rank)
+    return entities
+
+
+def microdata_item(elem: Tag) -> Dict:
+    """
+    Convert a microdata itemscope element into a JSON-LD shaped dict.
+
+    Args:
+        elem: Element carrying itemscope/itemtype
+
+    Returns:
+        Dictionary of item properties, with nested items as dicts
+    """
+    item = {}
+    itemtype = elem.get('itemtype') or ''
+    type_match = re.search(r'schema\.org/(\w+)', itemtype)
+    if type_match:
+        item['@type'] = type_match.group(1)
+
+    stack = list(elem.children)
+    while stack:
+        child = stack.pop(0)
+        if not isinstance(child, Tag):
+            continue
+
+        props = (child.get('itemprop') or '').split()
+        nested = child.has_attr('itemscope')
+        if props:
+            value = microdata_item(child) if nested else _microdata_value(child)
+            for prop in props:
+                item.setdefault(prop, value)
+        if not nested:
+            # Children come first so properties are read in document order
+            stack[0:0] = list(child.children)
+
+    return item
+
+
+def is_attorney_microdata(elem: Tag) -> bool:
+    """Whether an itemscope element is an Attorney, LegalService or Person."""
+    itemtype = elem.get('itemtype')
+    return bool(itemtype and MICRODATA_TYPE_PATTERN.search(itemtype))
+
+
+def entity_fields(entity: Dict) -> Dict:
+    """
+    Read raw attorney fields from a schema.org entity.
+
+    Gaps in a Person entity are filled from the organisation it works for.
+
+    Args:
+        entity: JSON-LD or microdata entity
+
+    Returns:
+        Dictionary with name, telephones, emails, url, address parts and
+        practice text; values are raw and not yet validated
+    """
+    fields = {
+        'name': _text(entity.get('name')) or _person_name(entity),
+        'telephones': _texts(entity.get('telephone')),
+        'emails': [_strip_mailto(email) for email in _texts(entity.get('email'))],
+        'url': _text(entity.get('url')),
+        'address': None,
+        'city': None,
+        'state': None,
+        'zip_code': None,
+        'practice_text': ' '.join(
+            _texts(entity.get('knowsAbout')) + _texts(entity.get('serviceType'))
+        )
+    }
+    fields.update(_address_fields(entity.get('address')))
+
+    employer = entity.get('worksFor') or entity.get('memberOf')
+    if isinstance(employer, list):
+        employer = employer[0] if employer else None
+    if isinstance(employer, dict):
+        employer_fields = entity_fields({k: v for k, v in employer.items() if k not in ('worksFor', 'memberOf')})
+        for key, value in employer_fields.items():
+            if key == 'name':
+                continue
+            if not fields[key]:
+                fields[key] = value
+
+    return fields
+
+
+def _entity_rank(node: Dict) -> Optional[int]:
+    """Priority of an entity's type, or None if it is not an attorney type."""
+    types = node.get('@type')
+    if not isinstance(types, list):
+        types = [types]
+    ranks = [ATTORNEY_TYPES.index(t) for t in types if t in ATTORNEY_TYPES]
+    return min(ranks) if ranks else None
+
+
+def _microdata_value(elem: Tag) -> Optional[str]:
+    """Value of a microdata property element per the HTML spec."""
+    if elem.name == 'meta':
+        return elem.get('content')
+    if elem.name in ('a', 'link', 'area'):
+        return elem.get('href')
+    if elem.name in ('img', 'audio', 'video', 'source'):
+        return elem.get('src')
+    if elem.name == 'time' and elem.get('datetime'):
+        return elem.get('datetime')
+    return elem.get_text(strip=True)
+
+
+def _address_fields(address) -> Dict:
+    """Split a schema.org address (text or PostalAddress) into components."""
+    if isinstance(address, list):
+        address = address[0] if address else None
+
+    if isinstance(address, dict):
+        return {
+            'address': _text(address.get('streetAddress')),
+            'city': _text(address.get('addressLocality')),
+            'state': _text(address.get('addressRegion')),
+            'zip_code': _text(address.get('postalCode'))
+        }
+    if isinstance(address, str) and address.strip():
+        return {'address': address.strip()}
+    return {}
+
+
+def _person_name(entity: Dict) -> Optional[str]:
+    """Build a name from givenName/familyName when name is missing."""
+    parts = [_text(entity.get('givenName')), _text(entity.get('familyName'))]
+    name = ' '.join(part for part in parts if part)
+    return name or None
+
+
+def _strip_mailto(email: str) -> str:
+    """Remove a mailto: prefix from an email value."""
+    return email.replace('mailto:', '').strip()
+
+
+def _text(value) -> Optional[str]:
+    """First non-empty string in a schema.org value."""
+    texts = _texts(value)
+    return texts[0] if texts else None
+
+
+def _texts(value) -> List[str]:
+    """All non-empty strings in a schema.org value (string, list or named thing)."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        texts = []
+        for item in value:
+            texts.extend(_texts(item))
+        return texts
+    if isinstance(value, dict):
+        return _texts(value.get('name'))
+    if isinstance(value, (int, float)):
+        value = str(value)
+    if isinstance(value, str) and value.strip():
+        return [value.strip()]
+    return []